@@ -1,21 +1,41 @@
 from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
 import os
-from prometheus_client import make_asgi_app
+import tempfile
+from prometheus_client import CollectorRegistry, REGISTRY, make_asgi_app, multiprocess
+from .middleware import CORSMiddleware
 from .routes import documents
-from ..config.settings import settings
+from ..config.settings import API_V1_STR, settings
+from ..services.docling_service import shutdown_pools
+from ..services._redis import close_redis_pool
+from ..services._es import close_es_client
 from ..utils.logging import logger
 from ..config.logging_config import configure_logging
 
+# Under PROMETHEUS_MULTIPROC_DIR each worker records into its own files without
+# cross-process locking, and the collector sums the shards at scrape time
+_MULTIPROCESS_METRICS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+def _metrics_registry() -> CollectorRegistry:
+    if not _MULTIPROCESS_METRICS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handlers."""
     logger.info("Starting application")
     yield
     logger.info("Shutting down application")
+    shutdown_pools()
+    await close_redis_pool()
+    await close_es_client()
+    if _MULTIPROCESS_METRICS:
+        multiprocess.mark_process_dead(os.getpid())
 
 app = FastAPI(
     title="Document Processing Pipeline",
@@ -24,6 +44,8 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+DOCUMENTS_PREFIX = f"{API_V1_STR}/documents"
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -34,13 +56,13 @@ app.add_middleware(
 )
 
 # Mount Prometheus metrics
-metrics_app = make_asgi_app()
+metrics_app = make_asgi_app(registry=_metrics_registry())
 app.mount("/metrics", metrics_app)
 
 # Include routers
 app.include_router(
     documents.router,
-    prefix=f"{settings.API_V1_STR}/documents",
+    prefix=DOCUMENTS_PREFIX,
     tags=["documents"]
 )
 
@@ -49,18 +71,46 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
-def start_server():
-    """Start the FastAPI server."""
+_HEALTH_BODY = b'{"status":"healthy"}'
+_HEALTH_START = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_HEALTH_BODY)).encode("latin-1")),
+    ],
+}
+_HEALTH_RESPONSE = {"type": "http.response.body", "body": _HEALTH_BODY}
+
+async def root(scope, receive, send):
+    """ASGI entry point that answers probes before the middleware stack runs."""
+    if scope["type"] == "http":
+        path = scope["path"]
+        if path == "/health":
+            await send(_HEALTH_START)
+            await send(_HEALTH_RESPONSE)
+            return
+        if path == "/metrics" or path == "/metrics/":
+            await metrics_app(scope, receive, send)
+            return
+    await app(scope, receive, send)
+
+def _server_config(default_log_level: str):
+    """Read host, port and log level from the environment and configure logging."""
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "50007"))
-    log_level = os.getenv("LOG_LEVEL", "info").lower()
+    log_level = os.getenv("LOG_LEVEL", default_log_level).lower()
     
     # Configure logging
     configure_logging(level=log_level.upper())
     logger.info(f"Starting server on {host}:{port}")
-    
+    return host, port, log_level
+
+def start_dev():
+    """Start the FastAPI server with auto-reload and access logging."""
+    host, port, log_level = _server_config("info")
     uvicorn.run(
-        "doc_pipeline.api.main:app",
+        "doc_pipeline.api.main:root",
         host=host,
         port=port,
         reload=True,
@@ -68,5 +118,32 @@ def start_server():
         log_level=log_level
     )
 
+def start_prod():
+    """Start the FastAPI server on uvloop/httptools with multiple workers."""
+    host, port, log_level = _server_config("warning")
+    # Workers inherit this, so any of them can answer /metrics for all of them
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="doc_pipeline_metrics_")
+    uvicorn.run(
+        "doc_pipeline.api.main:root",
+        host=host,
+        port=port,
+        workers=settings.WEB_CONCURRENCY,
+        loop="uvloop",
+        http="httptools",
+        reload=False,
+        access_log=False,
+        log_level=log_level,
+        proxy_headers=True,
+        server_header=False
+    )
+
+def start_server():
+    """Start the FastAPI server; set RELOAD=true for the development server."""
+    if os.getenv("RELOAD", "false").lower() == "true":
+        start_dev()
+    else:
+        start_prod()
+
 if __name__ == "__main__":
     start_server()
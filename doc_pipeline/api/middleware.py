@@ -0,0 +1,123 @@
+from typing import Iterable, List, Optional, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+
+class CORSMiddleware:
+    """Pure-ASGI CORS middleware with header values precomputed at startup."""
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str] = (),
+        allow_methods: Iterable[str] = ("GET",),
+        allow_headers: Iterable[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600
+    ):
+        allow_origins = tuple(allow_origins)
+        allow_methods = tuple(allow_methods)
+        allow_headers = tuple(allow_headers)
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_credentials = allow_credentials
+        self._allow_origins = frozenset(o.encode("latin-1") for o in allow_origins)
+        self._allow_methods = frozenset(m.encode("latin-1") for m in allow_methods)
+        self._allow_headers = frozenset(h.lower().encode("latin-1") for h in allow_headers)
+
+        # With credentials the origin has to be echoed back, so only the
+        # wildcard form can be shared between requests.
+        self._echo_origin = self.allow_credentials or not self.allow_all_origins
+        self._simple_headers: Headers = []
+        self._preflight_headers: Headers = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+        ]
+        if not self.allow_all_headers and allow_headers:
+            self._preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(sorted(allow_headers)).encode("latin-1"))
+            )
+        if self.allow_credentials:
+            self._simple_headers.append((b"access-control-allow-credentials", b"true"))
+            self._preflight_headers.append((b"access-control-allow-credentials", b"true"))
+        if not self._echo_origin:
+            self._simple_headers.append((b"access-control-allow-origin", b"*"))
+            self._preflight_headers.append((b"access-control-allow-origin", b"*"))
+
+    def _is_allowed_origin(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self._allow_origins
+
+    def _origin_headers(self, origin: bytes) -> Headers:
+        if not self._echo_origin:
+            return []
+        return [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight_response(origin, request_method, request_headers, send)
+            return
+
+        if not self._is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = self._simple_headers + self._origin_headers(origin)
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight_response(
+        self,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: Optional[bytes],
+        send
+    ) -> None:
+        """Answer a preflight request directly without invoking the app."""
+        allowed = self._is_allowed_origin(origin) and request_method in self._allow_methods
+        headers = self._preflight_headers + self._origin_headers(origin)
+
+        if request_headers:
+            if self.allow_all_headers:
+                headers = headers + [(b"access-control-allow-headers", request_headers)]
+            else:
+                requested = {h.strip().lower() for h in request_headers.split(b",")}
+                allowed = allowed and requested <= self._allow_headers
+
+        body = b"OK" if allowed else b"Disallowed CORS request"
+        await send({
+            "type": "http.response.start",
+            "status": 200 if allowed else 400,
+            "headers": headers + [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
 from typing import List, Optional
 from contextlib import asynccontextmanager
 from ...models.document import Document, DocumentStatus
 from ...models.job import Job, JobStatus
-from ...services.document_processor import DocumentProcessor
+from ...services.document_processor import DocumentProcessor, QueueFullError
 from ...services.embedding_service import EmbeddingService
 from ...services.vector_storage import VectorStorage
 from ...utils.logging import logger
@@ -16,6 +16,7 @@ async def lifespan(app):
     yield
     await document_processor.stop()
     await vector_storage.close()
+    await embedding_service.close()
     logger.info("API routes shutdown")
 
 router = APIRouter(lifespan=lifespan)
@@ -24,10 +25,7 @@ embedding_service = EmbeddingService()
 vector_storage = VectorStorage()
 
 @router.post("/documents/", response_model=Document)
-async def upload_document(
-    file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None
-):
+async def upload_document(file: UploadFile = File(...)):
     """Upload a document for processing."""
     try:
         content = await file.read()
@@ -38,6 +36,9 @@ async def upload_document(
         )
         logger.info(f"Document uploaded: {document.doc_id}")
         return document
+    except QueueFullError as e:
+        logger.warning(f"Rejected upload {file.filename}: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error uploading document: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -57,10 +58,21 @@ async def get_document(doc_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/documents/{doc_id}/status", response_model=DocumentStatus)
-async def get_document_status(doc_id: str):
-    """Get the current status of a document."""
+async def get_document_status(
+    doc_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for COMPLETED or FAILED before answering")
+):
+    """Get the current status of a document.
+
+    With ``wait``, the request is held until processing finishes or the wait
+    runs out, so clients need not poll. Only the worker that accepted the
+    upload can wait on it; others answer straight away.
+    """
     try:
-        status = await document_processor.get_document_status(doc_id)
+        if wait:
+            status = await document_processor.wait_for_completion(doc_id, timeout=wait)
+        else:
+            status = await document_processor.get_document_status(doc_id)
         if not status:
             raise HTTPException(status_code=404, detail="Document not found")
         return status
@@ -84,7 +96,7 @@ async def process_document(doc_id: str):
         # Reset status and resubmit for processing
         document.status = DocumentStatus.PENDING
         await document_processor.submit_document(
-            content=b"",  # Content will be loaded from storage
+            content=document.decode_content(),
             filename=document.filename,
             content_type=document.content_type
         )
@@ -109,8 +121,14 @@ async def generate_embeddings(doc_id: str, provider: str = "nomic"):
                 detail="Document must be in COMPLETED state to generate embeddings"
             )
         
-        # TODO: Implement actual embedding generation
-        raise HTTPException(status_code=501, detail="Embedding generation not implemented yet")
+        try:
+            embeddings = await embedding_service.generate_embeddings(document.chunks, provider_name=provider)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # Index all of the document's vectors in one bulk call
+        await vector_storage.store_embeddings(embeddings)
+        return {"doc_id": doc_id, "provider": provider, "embeddings": len(embeddings)}
     except HTTPException:
         raise
     except Exception as e:
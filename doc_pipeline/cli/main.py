@@ -1,54 +1,81 @@
 import click
-import requests
+import anyio
+import httpx
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional, Tuple
 
 API_URL = "http://localhost:50007"
 
+def _run(command: Callable[..., Awaitable[None]], *args) -> None:
+    """Run an async command with one pooled HTTP/2 client shared by all its requests."""
+    async def main():
+        async with httpx.AsyncClient(
+            base_url=API_URL,
+            http2=True,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=20)
+        ) as client:
+            await command(client, *args)
+    anyio.run(main)
+
 @click.group()
 def cli():
     """Document Processing Pipeline CLI"""
     pass
 
-@cli.command()
-@click.argument('file_path', type=click.Path(exists=True))
-def upload(file_path: str):
-    """Upload a document for processing"""
-    path = Path(file_path)
-    files = {'file': (path.name, open(path, 'rb'))}
-    response = requests.post(f"{API_URL}/documents/", files=files)
+async def _upload_one(client: httpx.AsyncClient, path: Path) -> None:
+    # httpx streams file objects in chunks, so large files are not read into memory
+    with path.open('rb') as f:
+        response = await client.post("/documents/", files={'file': (path.name, f)})
     if response.status_code == 200:
         click.echo(f"Document uploaded successfully: {response.json()}")
     else:
-        click.echo(f"Error uploading document: {response.text}", err=True)
+        click.echo(f"Error uploading {path.name}: {response.text}", err=True)
+
+async def _upload(client: httpx.AsyncClient, file_paths: Tuple[str, ...]) -> None:
+    async with anyio.create_task_group() as tg:
+        for file_path in file_paths:
+            tg.start_soon(_upload_one, client, Path(file_path))
 
 @cli.command()
-@click.argument('doc_id')
-def status(doc_id: str):
-    """Get document processing status"""
-    response = requests.get(f"{API_URL}/documents/{doc_id}/status")
+@click.argument('file_paths', nargs=-1, required=True, type=click.Path(exists=True))
+def upload(file_paths: Tuple[str, ...]):
+    """Upload one or more documents for processing"""
+    _run(_upload, file_paths)
+
+async def _status(client: httpx.AsyncClient, doc_id: str) -> None:
+    response = await client.get(f"/documents/{doc_id}/status")
     if response.status_code == 200:
         click.echo(f"Document status: {response.json()}")
     else:
         click.echo(f"Error getting status: {response.text}", err=True)
 
 @cli.command()
-@click.argument('query')
-@click.option('--provider', default='nomic', help='Embedding provider to use')
-@click.option('--k', default=10, help='Number of results to return')
-def search(query: str, provider: str, k: int):
-    """Search for similar documents"""
+@click.argument('doc_id')
+def status(doc_id: str):
+    """Get document processing status"""
+    _run(_status, doc_id)
+
+async def _search(client: httpx.AsyncClient, query: str, provider: str, k: int) -> None:
     params = {
         'query': query,
         'provider': provider,
         'k': k
     }
-    response = requests.post(f"{API_URL}/documents/search", json=params)
+    response = await client.post("/documents/search", json=params)
     if response.status_code == 200:
         click.echo(json.dumps(response.json(), indent=2))
     else:
         click.echo(f"Error searching documents: {response.text}", err=True)
 
+@cli.command()
+@click.argument('query')
+@click.option('--provider', default='nomic', help='Embedding provider to use')
+@click.option('--k', default=10, help='Number of results to return')
+def search(query: str, provider: str, k: int):
+    """Search for similar documents"""
+    _run(_search, query, provider, k)
+
 if __name__ == '__main__':
-    cli()
\ No newline at end of file
+    cli()
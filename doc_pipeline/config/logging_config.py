@@ -3,20 +3,13 @@ from typing import Dict, Any
 import sys
 
 def configure_logging(level: str = "INFO") -> None:
-    """Configure logging with JSON formatting and proper UTC timestamps."""
+    """Configure logging with orjson-encoded records and proper UTC timestamps."""
     config: Dict[str, Any] = {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {
-            "json": {
-                "()": "doc_pipeline.utils.logging.CustomJsonFormatter",
-                "format": "%(timestamp)s %(level)s %(module)s %(function)s %(message)s"
-            }
-        },
         "handlers": {
             "console": {
-                "class": "logging.StreamHandler",
-                "formatter": "json",
+                "()": "doc_pipeline.utils.logging.OrjsonHandler",
                 "stream": sys.stdout
             }
         },
@@ -1,14 +1,18 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field, ConfigDict
-from typing import Dict, List, Optional
+from typing import Dict, Final, List, Optional
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Read once at import so hot paths can use a plain module constant
+API_V1_STR: Final[str] = os.getenv("API_V1_STR", "/api/v1")
+
 class Settings(BaseSettings):
     # API Settings
-    API_V1_STR: str = "/api/v1"
+    API_V1_STR: str = API_V1_STR
     PROJECT_NAME: str = "Document Processing Pipeline"
     
     # Security
@@ -21,11 +25,29 @@ class Settings(BaseSettings):
     ELASTICSEARCH_USERNAME: Optional[str] = os.getenv("ELASTICSEARCH_USERNAME")
     ELASTICSEARCH_PASSWORD: Optional[str] = os.getenv("ELASTICSEARCH_PASSWORD")
     ELASTICSEARCH_USE_SSL: bool = os.getenv("ELASTICSEARCH_USE_SSL", "false").lower() == "true"
+    ES_CONNECTIONS_PER_NODE: int = int(os.getenv("ES_CONNECTIONS_PER_NODE", "64"))
+    ES_REFRESH_INTERVAL: str = os.getenv("ES_REFRESH_INTERVAL", "30s")
+    ES_NUMBER_OF_REPLICAS: int = int(os.getenv("ES_NUMBER_OF_REPLICAS", "0"))
+    ES_TRANSLOG_FLUSH_THRESHOLD: str = os.getenv("ES_TRANSLOG_FLUSH_THRESHOLD", "1gb")
+    ES_TRANSLOG_DURABILITY: str = os.getenv("ES_TRANSLOG_DURABILITY", "async")
+    # int8-quantized HNSW by default; set to false for full-precision float32 hnsw
+    VECTOR_QUANTIZATION: bool = os.getenv("VECTOR_QUANTIZATION", "true").lower() == "true"
+    ES_HNSW_M: int = int(os.getenv("ES_HNSW_M", "16"))
+    ES_HNSW_EF_CONSTRUCTION: int = int(os.getenv("ES_HNSW_EF_CONSTRUCTION", "100"))
+    ES_KNN_CANDIDATES_FACTOR: int = int(os.getenv("ES_KNN_CANDIDATES_FACTOR", "10"))
+    VECTOR_QUERY_CACHE_SIZE: int = int(os.getenv("VECTOR_QUERY_CACHE_SIZE", "1024"))
+    VECTOR_QUERY_CACHE_TTL: float = float(os.getenv("VECTOR_QUERY_CACHE_TTL", "60"))
+    ES_BULK_REFRESH_THRESHOLD: int = int(os.getenv("ES_BULK_REFRESH_THRESHOLD", "1000"))
+    ES_BULK_CHUNK_SIZE: int = int(os.getenv("ES_BULK_CHUNK_SIZE", "1000"))
+    ES_BULK_MAX_CHUNK_BYTES: int = int(os.getenv("ES_BULK_MAX_CHUNK_BYTES", str(10 * 1024 * 1024)))
+    ES_BULK_MAX_RETRIES: int = int(os.getenv("ES_BULK_MAX_RETRIES", "3"))
+    ES_BULK_INITIAL_BACKOFF: float = float(os.getenv("ES_BULK_INITIAL_BACKOFF", "2"))
     
     # Redis Settings
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
     
     # Embedding Settings
     NOMIC_API_KEY: str = os.getenv("NOMIC_API_KEY", "")
@@ -41,6 +63,11 @@ class Settings(BaseSettings):
     # Embedding Cache Settings
     EMBEDDING_CACHE_TTL: int = int(os.getenv("EMBEDDING_CACHE_TTL", "86400"))  # 24 hours
     EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_MAX_INFLIGHT: int = int(os.getenv("EMBEDDING_MAX_INFLIGHT", "16"))
+    EMBEDDING_HTTP_POOL: int = int(os.getenv("EMBEDDING_HTTP_POOL", "100"))
+    EMBEDDING_HTTP_TIMEOUT: float = float(os.getenv("EMBEDDING_HTTP_TIMEOUT", "30"))
+    # Only enable for providers that accept gzip-encoded request bodies
+    EMBEDDING_GZIP_REQUESTS: bool = os.getenv("EMBEDDING_GZIP_REQUESTS", "false").lower() == "true"
     
     # Document Processing Settings
     MAX_CHUNK_SIZE: int = 1000
@@ -48,6 +75,18 @@ class Settings(BaseSettings):
     CHUNK_OVERLAP: int = 50
     DEFAULT_CHUNKING_STRATEGY: str = "hybrid"
     TOKENIZER_NAME: str = "BAAI/bge-small-en-v1.5"
+    PROCESSING_QUEUE_SIZE: int = int(os.getenv("PROCESSING_QUEUE_SIZE", str(BATCH_SIZE * 2)))
+    MAX_CONCURRENT_JOBS: int = int(os.getenv("MAX_CONCURRENT_JOBS", str(os.cpu_count() or 1)))
+    QUEUE_BATCH_TIMEOUT: float = float(os.getenv("QUEUE_BATCH_TIMEOUT", "0.01"))
+    SUBMIT_TIMEOUT: float = float(os.getenv("SUBMIT_TIMEOUT", "5"))
+    # Every uvicorn worker starts its own pools, so by default each gets its share of the host
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    DOCLING_MAX_WORKERS: int = int(os.getenv(
+        "DOCLING_MAX_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+    ))
+    CHUNK_MAX_WORKERS: int = int(os.getenv(
+        "CHUNK_MAX_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+    ))
 
     # Chunking Settings
     CHUNK_MIN_SIZE: int = 100
@@ -55,6 +94,14 @@ class Settings(BaseSettings):
     SENTENCE_OVERLAP: bool = True
     PRESERVE_MARKDOWN_STRUCTURE: bool = True
     
-    model_config = ConfigDict(case_sensitive=True)
+    model_config = ConfigDict(case_sensitive=True, frozen=True)
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Parse the environment once and return the shared, read-only Settings."""
+    return Settings()
+
+settings = get_settings()
 
-settings = Settings()
\ No newline at end of file
+# Values read on per-request paths, bound once as plain module constants
+EMBEDDING_BATCH_SIZE: Final[int] = settings.EMBEDDING_BATCH_SIZE
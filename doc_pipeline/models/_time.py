@@ -0,0 +1,5 @@
+from datetime import datetime, UTC
+from functools import partial
+
+# C-level callable, avoids a Python lambda frame per timestamp
+utc_now = partial(datetime.now, UTC)
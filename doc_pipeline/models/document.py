@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
-from datetime import datetime, UTC
+from datetime import datetime
 from enum import Enum
-import base64  # Required for encoding/decoding
+from ._time import utc_now
+import pybase64  # SIMD-accelerated, same API as the stdlib base64 module
 
 class DocumentStatus(str, Enum):
     PENDING = "pending"
@@ -30,19 +31,24 @@ class Document(BaseModel):
     status: DocumentStatus
     chunks: List[DocumentChunk] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     error_message: Optional[str] = None
 
+    @staticmethod
+    def encode_bytes(content: bytes) -> str:
+        """Base64-encode raw upload bytes into the form stored in content."""
+        return pybase64.b64encode(content).decode("utf-8")
+
     # 🔹 Automatically encode content to Base64 (if storing binary data)
     def encode_content(self):
         if isinstance(self.content, bytes):
-            self.content = base64.b64encode(self.content).decode("utf-8")  # Store as Base64 string
+            self.content = self.encode_bytes(self.content)  # Store as Base64 string
 
     # 🔹 Decode Base64 back into bytes (when needed)
     def decode_content(self) -> bytes:
         try:
-            return base64.b64decode(self.content.encode("utf-8"))
+            return pybase64.b64decode(self.content.encode("utf-8"))
         except Exception:
             return self.content  # If already string, return as is
 
@@ -53,4 +59,4 @@ class DocumentEmbedding(BaseModel):
     embedding_provider: str
     embedding: List[float]
     metadata: Dict[str, Any] = Field(default_factory=dict)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(default_factory=utc_now)
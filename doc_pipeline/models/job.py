@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
-from datetime import datetime, UTC
+from datetime import datetime
 from enum import Enum
+from ._time import utc_now
 
 class JobStatus(str, Enum):
     QUEUED = "queued"
@@ -24,8 +25,8 @@ class Job(BaseModel):
     job_type: JobType
     status: JobStatus
     priority: int = 0
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
@@ -0,0 +1,109 @@
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_streaming_bulk
+from elasticsearch.serializer import OrjsonSerializer
+from ..config.settings import settings
+from ..utils.logging import logger
+
+_CLIENT: Optional[AsyncElasticsearch] = None
+
+def get_es_client() -> AsyncElasticsearch:
+    """Return the process-wide Elasticsearch client shared by every storage service.
+
+    The client is itself a connection pool, so one instance lets requests to
+    the documents, jobs and embeddings indices reuse the same connections.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        # Ensure scheme is explicitly added
+        es_host = settings.ELASTICSEARCH_HOST
+        if not es_host.startswith("http://") and not es_host.startswith("https://"):
+            scheme = "https" if settings.ELASTICSEARCH_USE_SSL else "http"
+            es_host = f"{scheme}://{es_host}"
+
+        _CLIENT = AsyncElasticsearch(
+            hosts=[f"{es_host}:{settings.ELASTICSEARCH_PORT}"],
+            basic_auth=(
+                settings.ELASTICSEARCH_USERNAME,
+                settings.ELASTICSEARCH_PASSWORD
+            ) if settings.ELASTICSEARCH_USERNAME else None,
+            connections_per_node=settings.ES_CONNECTIONS_PER_NODE,
+            http_compress=True,  # gzip request bodies; bulk vectors compress well
+            serializer=OrjsonSerializer()  # Also accepts numpy arrays as vectors
+        )
+    return _CLIENT
+
+async def close_es_client() -> None:
+    """Close the shared client; the next get_es_client() call opens a new one."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.close()
+        _CLIENT = None
+
+def index_settings() -> Dict[str, Any]:
+    """Index settings tuned for ingestion-heavy workloads, shared by every create_index."""
+    return {
+        "refresh_interval": settings.ES_REFRESH_INTERVAL,
+        "number_of_replicas": settings.ES_NUMBER_OF_REPLICAS,
+        "translog": {
+            "flush_threshold_size": settings.ES_TRANSLOG_FLUSH_THRESHOLD,
+            "durability": settings.ES_TRANSLOG_DURABILITY
+        }
+    }
+
+def vector_index_options() -> Dict[str, Any]:
+    """HNSW graph parameters for dense_vector fields."""
+    return {
+        "type": "int8_hnsw" if settings.VECTOR_QUANTIZATION else "hnsw",
+        "m": settings.ES_HNSW_M,
+        "ef_construction": settings.ES_HNSW_EF_CONSTRUCTION
+    }
+
+@asynccontextmanager
+async def bulk_load(es: AsyncElasticsearch, index: str, size: int):
+    """Pause refreshes on index while a large bulk load of size items runs.
+
+    Loads smaller than ES_BULK_REFRESH_THRESHOLD are left alone, since
+    toggling the setting costs two extra requests.
+    """
+    if size < settings.ES_BULK_REFRESH_THRESHOLD:
+        yield
+        return
+
+    await es.indices.put_settings(index=index, settings={"index": {"refresh_interval": "-1"}})
+    try:
+        yield
+    finally:
+        await es.indices.put_settings(
+            index=index,
+            settings={"index": {"refresh_interval": settings.ES_REFRESH_INTERVAL}}
+        )
+
+async def bulk_index(es: AsyncElasticsearch, index: str, sources: Iterable[Tuple[str, Any]]) -> int:
+    """Stream (id, source) pairs into index with the bulk API; returns the number indexed.
+
+    Requests are sized by ES_BULK_CHUNK_SIZE / ES_BULK_MAX_CHUNK_BYTES, and
+    429-rejected chunks are retried with exponential backoff. Per-document
+    failures are logged rather than raised so one bad document does not
+    abort the rest of the load.
+    """
+    actions = (
+        {"_op_type": "index", "_index": index, "_id": doc_id, "_source": source}
+        for doc_id, source in sources
+    )
+    indexed = 0
+    async for ok, info in async_streaming_bulk(
+        es,
+        actions,
+        chunk_size=settings.ES_BULK_CHUNK_SIZE,
+        max_chunk_bytes=settings.ES_BULK_MAX_CHUNK_BYTES,
+        max_retries=settings.ES_BULK_MAX_RETRIES,
+        initial_backoff=settings.ES_BULK_INITIAL_BACKOFF,
+        raise_on_error=False
+    ):
+        if ok:
+            indexed += 1
+        else:
+            logger.error(f"Bulk indexing into {index} failed: {info}")
+    return indexed
@@ -0,0 +1,28 @@
+from typing import Optional
+import redis.asyncio as aioredis
+from ..config.settings import settings
+
+_POOL: Optional[aioredis.ConnectionPool] = None
+
+def get_redis_pool() -> aioredis.ConnectionPool:
+    """Return the process-wide Redis connection pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = aioredis.ConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD or None,
+            max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+    return _POOL
+
+def get_redis() -> aioredis.Redis:
+    """Async Redis client backed by the shared pool; cheap to create per service."""
+    return aioredis.Redis(connection_pool=get_redis_pool())
+
+async def close_redis_pool() -> None:
+    """Disconnect every pooled connection; the next get_redis() call opens a new pool."""
+    global _POOL
+    if _POOL is not None:
+        await _POOL.disconnect()
+        _POOL = None
@@ -1,26 +1,453 @@
+import asyncio
+import logging
+import multiprocessing
 import os
+import re
 import magic
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 
-from docling.document_converter import DocumentConverter
+from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.chunking import HybridChunker
-from docling.datamodel.base_models import DocumentStream
+from docling.datamodel.base_models import DocumentStream, InputFormat
+from docling_core.types.doc import DoclingDocument
+from transformers import AutoTokenizer
 import magic.magic
 
+try:
+    # Threaded PDF pipeline (overlapping OCR/layout/table stages), newer Docling only
+    from docling.datamodel.accelerator_options import AcceleratorDevice, AcceleratorOptions
+    from docling.datamodel.pipeline_options import ThreadedPdfPipelineOptions
+    from docling.pipeline.threaded_standard_pdf_pipeline import ThreadedStandardPdfPipeline
+except ImportError:
+    ThreadedStandardPdfPipeline = None
+
 from ..models.document import DocumentChunk
 from ..utils.logging import logger
-from ..utils.metrics import track_processing_time
+from ..utils.metrics import track_chunking
 from ..config.settings import settings
 
+# Leading-byte signatures for the formats we accept; anything else goes to libmagic
+_MIME_SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+# One C-level startswith rejects content matching none of the signatures
+_SIGNATURE_PREFIXES = tuple(signature for signature, _ in _MIME_SIGNATURES)
+_HTML_SIGNATURES = (b"<!doctype html", b"<html")
+
+# OOXML part directories, looked up in the zip central directory
+_OOXML_TYPES = (
+    (b"word/", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (b"xl/", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    (b"ppt/", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+)
+_ZIP_TAIL_SIZE = 64 * 1024
+
+# libmagic only inspects leading bytes; 4 KiB covers every pattern in its database
+_MAGIC_PREFIX_SIZE = 4096
+
+# Sentence spans with their trailing whitespace. The quantifiers are possessive:
+# the character classes are disjoint, so backtracking could never find another
+# match and would only cost time on long runs without sentence endings
+_SENTENCE_RE = re.compile(r'([^.!?]++[.!?]++(?:\s+|$))')
+_WORD_RE = re.compile(r'\S+')
+_HEADING_RE = re.compile(r'^#[^\n]*', re.MULTILINE)
+
+# Split points tried in turn by the recursive chunker: paragraphs, sentence
+# ends, then any whitespace
+_RECURSIVE_SEPARATORS = (
+    re.compile(r'\n\s*\n'),
+    re.compile(r'(?<=[.!?])\s+'),
+    re.compile(r'\s+'),
+)
+
+# Extensions Docling does not accept, mapped to the format it should read them as
+_EXT_REWRITE = {".txt": ".md"}
+
+def _sniff_zip_type(content: bytes) -> Optional[str]:
+    """Tell OOXML documents apart using the zip central directory at the end of the file."""
+    start = max(0, len(content) - _ZIP_TAIL_SIZE)
+    if content.find(b"[Content_Types].xml", start) == -1:
+        return None
+    for marker, mime_type in _OOXML_TYPES:
+        if content.find(marker, start) != -1:
+            return mime_type
+    return None
+
+# Heavy objects are created once per process, on first use
+_CONVERTER: Optional[DocumentConverter] = None
+_MAGIC: Optional[magic.magic.Magic] = None
+_CONVERTER_POOL: Optional[ProcessPoolExecutor] = None
+_THREAD_POOL: Optional[ThreadPoolExecutor] = None
+_CHUNK_POOL: Optional[ProcessPoolExecutor] = None
+
+# Text chunking above this many characters runs in a separate process; below it
+# the pickling round-trip costs more than the GIL contention it avoids
+_PROCESS_CHUNK_THRESHOLD = 256 * 1024
+
+def _get_converter() -> DocumentConverter:
+    """Return this process's DocumentConverter, loading its models on first use."""
+    global _CONVERTER
+    if _CONVERTER is None:
+        if ThreadedStandardPdfPipeline is None:
+            _CONVERTER = DocumentConverter()
+        else:
+            pipeline_options = ThreadedPdfPipelineOptions(
+                accelerator_options=AcceleratorOptions(device=AcceleratorDevice.AUTO),
+                ocr_batch_size=4,
+                layout_batch_size=64,
+                table_batch_size=4
+            )
+            _CONVERTER = DocumentConverter(format_options={
+                InputFormat.PDF: PdfFormatOption(
+                    pipeline_cls=ThreadedStandardPdfPipeline,
+                    pipeline_options=pipeline_options
+                )
+            })
+    return _CONVERTER
+
+def _get_magic() -> magic.magic.Magic:
+    """Return this process's libmagic handle."""
+    global _MAGIC
+    if _MAGIC is None:
+        _MAGIC = magic.magic.Magic(mime=True)
+    return _MAGIC
+
+@lru_cache(maxsize=8)
+def _get_hybrid_chunker(tokenizer: str, chunk_size: int, chunk_overlap: int) -> HybridChunker:
+    """Return a HybridChunker for these parameters, loading the tokenizer only once.
+
+    chunk() only reads the tokenizer, so one instance is shared across threads.
+    """
+    return HybridChunker(
+        tokenizer=tokenizer,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+@lru_cache(maxsize=4)
+def _get_tokenizer(name: str):
+    """Load a fast (Rust-backed) tokenizer once per process."""
+    return AutoTokenizer.from_pretrained(name, use_fast=True)
+
+def _build_hybrid_chunks(chunker: HybridChunker, doc: DoclingDocument, strategy: str, id_prefix: str) -> List[DocumentChunk]:
+    """Build DocumentChunks in one pass over the chunker's generator.
+
+    The chunk count is only known at the end, so total_chunks is filled in afterwards.
+    """
+    chunks = [
+        # Every field is produced here, so skip pydantic validation; the
+        # strategies in process_document build their chunks the same way
+        DocumentChunk.model_construct(
+            chunk_id=f"{id_prefix}{i}",
+            content=chunk.text if hasattr(chunk, 'text') else str(chunk),
+            page_number=getattr(chunk, 'page_number', 1),
+            position=None,
+            metadata={
+                "headings": getattr(chunk, 'headings', []),
+                "type": "hybrid_chunk",
+                "chunk_number": i,
+                "total_chunks": 0,
+                "strategy": strategy
+            }
+        )
+        for i, chunk in enumerate(chunker.chunk(doc), 1)
+    ]
+    total = len(chunks)
+    for chunk in chunks:
+        chunk.metadata["total_chunks"] = total
+    return chunks
+
+def _convert_sync(source: DocumentStream) -> Optional[DoclingDocument]:
+    """Run a conversion inside a pool worker using the worker-local converter."""
+    result = _get_converter().convert(source)
+    if not result or not hasattr(result, 'document'):
+        return None
+    return result.document
+
+def get_converter_pool() -> ProcessPoolExecutor:
+    """Return the shared conversion pool, starting it on first use.
+
+    Worker processes are only spawned as conversions arrive, and each loads its
+    models on its first conversion, so idle API workers hold no model copies.
+    """
+    global _CONVERTER_POOL
+    if _CONVERTER_POOL is None:
+        # Spawn rather than fork: the parent runs an event loop and client threads
+        _CONVERTER_POOL = ProcessPoolExecutor(
+            max_workers=settings.DOCLING_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _CONVERTER_POOL
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """Return the bounded thread pool used for blocking work that stays in-process."""
+    global _THREAD_POOL
+    if _THREAD_POOL is None:
+        _THREAD_POOL = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            thread_name_prefix="docling"
+        )
+    return _THREAD_POOL
+
+def _get_chunk_pool() -> ProcessPoolExecutor:
+    """Return the process pool used to chunk large documents."""
+    global _CHUNK_POOL
+    if _CHUNK_POOL is None:
+        _CHUNK_POOL = ProcessPoolExecutor(
+            max_workers=settings.CHUNK_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _CHUNK_POOL
+
+def shutdown_pools() -> None:
+    """Stop the conversion and chunking pools, dropping any queued work."""
+    global _CONVERTER_POOL, _CHUNK_POOL, _THREAD_POOL
+    if _CONVERTER_POOL is not None:
+        _CONVERTER_POOL.shutdown(wait=True, cancel_futures=True)
+        _CONVERTER_POOL = None
+    if _CHUNK_POOL is not None:
+        _CHUNK_POOL.shutdown(wait=True, cancel_futures=True)
+        _CHUNK_POOL = None
+    if _THREAD_POOL is not None:
+        _THREAD_POOL.shutdown(wait=True, cancel_futures=True)
+        _THREAD_POOL = None
+
+def _chunk_markdown_text(content: str, chunk_size: int) -> List[Dict[str, Any]]:
+    """Chunk content based on markdown structure."""
+    chunks = []
+    headings = ()
+
+    # Chunks are emitted as slices of content; chunk_start is -1 while no
+    # chunk is open, and chunk_end is the end of its last line
+    chunk_start = -1
+    chunk_end = 0
+    current_size = 0
+
+    length = len(content)
+    pos = 0
+    while True:
+        end = content.find('\n', pos)
+        if end == -1:
+            end = length
+
+        # Check for headings
+        if content.startswith('#', pos, end):
+            # If we have content in current chunk, save it
+            if chunk_start != -1:
+                chunks.append({"text": content[chunk_start:chunk_end], "headings": headings})
+                chunk_start = -1
+                current_size = 0
+            headings = (content[pos:end].strip(),)
+        else:
+            line_size = end - pos
+            # If adding this line would exceed chunk size, save current chunk
+            if current_size + line_size > chunk_size and chunk_start != -1:
+                chunks.append({"text": content[chunk_start:chunk_end], "headings": headings})
+                chunk_start = -1
+                current_size = 0
+
+            if chunk_start == -1:
+                chunk_start = pos
+            chunk_end = end
+            current_size += line_size
+
+        if end == length:
+            break
+        pos = end + 1
+
+    # Add any remaining content
+    if chunk_start != -1:
+        chunks.append({"text": content[chunk_start:chunk_end], "headings": headings})
+
+    return chunks
+
+def _chunk_sentence_text(content: str, chunk_size: int) -> List[Dict[str, Any]]:
+    """Chunk content based on sentences with strict size limits."""
+    chunks = []
+
+    # Track headings
+    heading_lines = _HEADING_RE.findall(content)
+    headings = (heading_lines[-1].strip(),) if heading_lines else ()
+
+    # Chunks are emitted as slices of content spanning whole sentences;
+    # chunk_start is -1 while no chunk is open
+    chunk_start = -1
+    chunk_end = 0
+
+    # Split on sentence endings and preserve the endings
+    for match in _SENTENCE_RE.finditer(content):
+        # Span of the sentence without surrounding whitespace
+        sentence = match.group(1)
+        start = match.start(1) + len(sentence) - len(sentence.lstrip())
+        end = match.start(1) + len(sentence.rstrip())
+        if start >= end:
+            continue
+
+        # If a single sentence is larger than chunk_size, split it into smaller parts
+        if end - start > chunk_size:
+            if chunk_start != -1:
+                chunks.append({"text": content[chunk_start:chunk_end], "headings": headings})
+                chunk_start = -1
+
+            part_start = -1
+            part_end = 0
+            for word in _WORD_RE.finditer(content, start, end):
+                if part_start != -1 and word.end() - part_start > chunk_size:
+                    chunks.append({"text": content[part_start:part_end], "headings": headings})
+                    part_start = -1
+                if part_start == -1:
+                    part_start = word.start()
+                part_end = word.end()
+
+            if part_start != -1:
+                chunks.append({"text": content[part_start:part_end], "headings": headings})
+
+        # Normal case: try to combine sentences up to chunk_size
+        elif chunk_start == -1 or end - chunk_start <= chunk_size:
+            if chunk_start == -1:
+                chunk_start = start
+            chunk_end = end
+        else:
+            chunks.append({"text": content[chunk_start:chunk_end], "headings": headings})
+            chunk_start = start
+            chunk_end = end
+
+    # Add any remaining content
+    if chunk_start != -1:
+        chunks.append({"text": content[chunk_start:chunk_end], "headings": headings})
+
+    # Verify chunk sizes
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Created %d chunks with sizes: %s", len(chunks), [len(c['text']) for c in chunks])
+    return chunks
+
+def _count_tokens(tokenizer, texts: List[str]) -> List[int]:
+    """Count the tokens of many texts in one call.
+
+    Fast tokenizers encode a batch across all cores in Rust, so this beats
+    one encode() per piece without a pool of our own.
+    """
+    if not texts:
+        return []
+    encoding = tokenizer(texts, add_special_tokens=False, verbose=False)
+    return [len(ids) for ids in encoding["input_ids"]]
+
+def _token_windows(tokenizer, content: str, start: int, end: int, max_tokens: int) -> List[Tuple[int, int, int]]:
+    """Cut a span with no separator left into windows of max_tokens tokens."""
+    encoding = tokenizer(
+        content[start:end],
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        verbose=False
+    )
+    offsets = encoding["offset_mapping"]
+    windows = []
+    for i in range(0, len(offsets), max_tokens):
+        window = offsets[i:i + max_tokens]
+        windows.append((start + window[0][0], start + window[-1][1], len(window)))
+    return windows
+
+def _recursive_spans(
+    tokenizer,
+    content: str,
+    start: int,
+    end: int,
+    tokens: int,
+    max_tokens: int,
+    level: int = 0
+) -> List[Tuple[int, int, int]]:
+    """Split content[start:end], which holds tokens tokens, into (start, end, tokens) spans of at most max_tokens."""
+    if tokens <= max_tokens:
+        return [(start, end, tokens)]
+    if level == len(_RECURSIVE_SEPARATORS):
+        return _token_windows(tokenizer, content, start, end, max_tokens)
+
+    pieces = []
+    piece_start = start
+    for match in _RECURSIVE_SEPARATORS[level].finditer(content, start, end):
+        if match.start() > piece_start:
+            pieces.append((piece_start, match.start()))
+        piece_start = match.end()
+    if end > piece_start:
+        pieces.append((piece_start, end))
+
+    # Count every piece at this level in one batch, then descend only into the oversized ones
+    counts = _count_tokens(tokenizer, [content[piece_start:piece_end] for piece_start, piece_end in pieces])
+    spans = []
+    for (piece_start, piece_end), count in zip(pieces, counts):
+        spans.extend(_recursive_spans(tokenizer, content, piece_start, piece_end, count, max_tokens, level + 1))
+    return spans
+
+def _chunk_recursive_text(content: str, chunk_size: int) -> List[Dict[str, Any]]:
+    """Chunk content to at most chunk_size tokens, splitting as coarsely as possible.
+
+    Oversized text is split on paragraphs, then sentences, then whitespace;
+    afterwards any chunk under half of chunk_size absorbs its successor while
+    the pair still fits, so documents yield fewer, fuller chunks.
+
+    Merges are planned on summed piece counts and then re-measured, since
+    tokenizers other than WordPiece (BPE, for one) can count the joined text
+    differently; a merge that ends up over chunk_size is undone.
+    """
+    tokenizer = _get_tokenizer(settings.TOKENIZER_NAME)
+    tokens, = _count_tokens(tokenizer, [content])
+    spans = _recursive_spans(tokenizer, content, 0, len(content), tokens, chunk_size)
+
+    # (start, end, summed tokens, spans merged into it)
+    groups = []
+    half = chunk_size / 2
+    current = None
+    for span in spans:
+        if current is not None and current[2] < half and current[2] + span[2] <= chunk_size:
+            current = (current[0], span[1], current[2] + span[2], current[3] + (span,))
+            continue
+        if current is not None:
+            groups.append(current)
+        current = (span[0], span[1], span[2], (span,))
+    if current is not None:
+        groups.append(current)
+
+    # Re-measure only the merged chunks, all in one batch
+    merged_counts = iter(_count_tokens(
+        tokenizer,
+        [content[start:end] for start, end, _, parts in groups if len(parts) > 1]
+    ))
+    chunks = []
+    for start, end, tokens, parts in groups:
+        if len(parts) > 1:
+            tokens = next(merged_counts)
+            if tokens > chunk_size:
+                chunks.extend(parts)
+                continue
+        chunks.append((start, end, tokens))
+
+    return [
+        {"text": text, "tokens": tokens}
+        for text, tokens in ((content[start:end].strip(), tokens) for start, end, tokens in chunks)
+        if text
+    ]
+
 class ChunkingStrategy:
     """Enum-like class for chunking strategies"""
     HYBRID = "hybrid"
     MARKDOWN = "markdown"
     SENTENCE = "sentence"
+    RECURSIVE = "recursive"
     FALLBACK = "fallback"
 
+_VALID_STRATEGIES = frozenset(
+    value for name, value in vars(ChunkingStrategy).items() if not name.startswith("_")
+)
+
 class DoclingService:
     def __init__(
         self,
@@ -28,8 +455,7 @@ class DoclingService:
         chunk_overlap: int = 50,
         default_strategy: str = ChunkingStrategy.HYBRID
     ):
-        self.mime = magic.magic.Magic(mime=True)
-        self.converter = DocumentConverter()
+        self.mime = _get_magic()
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.default_strategy = default_strategy
@@ -47,163 +473,84 @@ class DoclingService:
             raise ValueError("chunk_overlap must be non-negative")
         if self.chunk_overlap >= self.chunk_size:
             raise ValueError("chunk_overlap must be less than chunk_size")
-        if self.default_strategy not in vars(ChunkingStrategy).values():
+        if self.default_strategy not in _VALID_STRATEGIES:
             raise ValueError(f"Invalid chunking strategy: {self.default_strategy}")
 
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the shared thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(_get_thread_pool(), func, *args)
+
     def _detect_mime_type(self, content: bytes) -> str:
         """Detect MIME type of the content."""
-        return self.mime.from_buffer(content)
+        if content.startswith(_SIGNATURE_PREFIXES):
+            for signature, mime_type in _MIME_SIGNATURES:
+                if content.startswith(signature):
+                    if mime_type == "application/zip":
+                        # Unrecognised archives are left to libmagic
+                        return _sniff_zip_type(content) or self.mime.from_buffer(content[:_MAGIC_PREFIX_SIZE])
+                    return mime_type
+        if content[:14].lower().startswith(_HTML_SIGNATURES):
+            return "text/html"
+        return self.mime.from_buffer(content[:_MAGIC_PREFIX_SIZE])
 
     def _chunk_by_markdown(self, content: str) -> List[Dict[str, Any]]:
         """Chunk content based on markdown structure."""
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        current_headings = []
-
-        for line in content.split('\n'):
-            # Check for headings
-            if line.startswith('#'):
-                # If we have content in current chunk, save it
-                if current_chunk:
-                    chunks.append({
-                        "text": '\n'.join(current_chunk),
-                        "headings": current_headings.copy()
-                    })
-                    current_chunk = []
-                    current_size = 0
-                current_headings = [line.strip()]
-            else:
-                line_size = len(line)
-                # If adding this line would exceed chunk size, save current chunk
-                if current_size + line_size > self.chunk_size and current_chunk:
-                    chunks.append({
-                        "text": '\n'.join(current_chunk),
-                        "headings": current_headings.copy()
-                    })
-                    current_chunk = []
-                    current_size = 0
-                
-                current_chunk.append(line)
-                current_size += line_size
-
-        # Add any remaining content
-        if current_chunk:
-            chunks.append({
-                "text": '\n'.join(current_chunk),
-                "headings": current_headings.copy()
-            })
-
-        return chunks
+        return _chunk_markdown_text(content, self.chunk_size)
 
     def _chunk_by_sentences(self, content: str) -> List[Dict[str, Any]]:
         """Chunk content based on sentences with strict size limits."""
-        import re
-        # Split on sentence endings and preserve the endings
-        sentence_pattern = r'([^.!?]+[.!?]+(?:\s+|$))'
-        sentences = re.findall(sentence_pattern, content)
-        
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        current_headings = []
-
-        # Track headings
-        for line in content.split('\n'):
-            if line.startswith('#'):
-                current_headings = [line.strip()]
-
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        return _chunk_sentence_text(content, self.chunk_size)
 
-            sentence_size = len(sentence)
-            
-            # If a single sentence is larger than chunk_size, split it into smaller parts
-            if sentence_size > self.chunk_size:
-                words = sentence.split()
-                current_part = []
-                current_part_size = 0
-                
-                for word in words:
-                    word_size = len(word) + 1  # +1 for space
-                    
-                    if current_part_size + word_size > self.chunk_size and current_part:
-                        chunks.append({
-                            "text": ' '.join(current_part),
-                            "headings": current_headings.copy()
-                        })
-                        current_part = []
-                        current_part_size = 0
-                    
-                    current_part.append(word)
-                    current_part_size += word_size
-                
-                if current_part:
-                    chunks.append({
-                        "text": ' '.join(current_part),
-                        "headings": current_headings.copy()
-                    })
-            
-            # Normal case: try to combine sentences up to chunk_size
-            elif current_size + sentence_size <= self.chunk_size:
-                current_chunk.append(sentence)
-                current_size += sentence_size
-            else:
-                if current_chunk:
-                    chunks.append({
-                        "text": ' '.join(current_chunk),
-                        "headings": current_headings.copy()
-                    })
-                current_chunk = [sentence]
-                current_size = sentence_size
-
-        # Add any remaining content
-        if current_chunk:
-            chunks.append({
-                "text": ' '.join(current_chunk),
-                "headings": current_headings.copy()
-            })
-
-        # Verify chunk sizes
-        logger.debug(f"Created {len(chunks)} chunks with sizes: {[len(c['text']) for c in chunks]}")
-        return chunks
+    async def _run_text_chunker(self, chunker, content: str) -> List[Dict[str, Any]]:
+        """Run a text chunker off the event loop, in a separate process for large documents."""
+        if len(content) > _PROCESS_CHUNK_THRESHOLD:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_chunk_pool(), chunker, content, self.chunk_size)
+        return await self._run_blocking(chunker, content, self.chunk_size)
 
-    @track_processing_time
+    @track_chunking
     async def process_document(
         self,
         content: bytes,
         filename: str,
         content_type: Optional[str] = None,
-        chunking_strategy: Optional[str] = None
+        chunking_strategy: Optional[str] = None,
+        doc_id: Optional[str] = None
     ) -> List[DocumentChunk]:
-        """Process a document using Docling and return chunks."""
+        """Process a document using Docling and return chunks.
+
+        Chunk IDs are ``{doc_id}-{n}``. Embeddings are cached and indexed by
+        chunk ID, so pass doc_id for anything that gets embedded; without it
+        the IDs are the document-local ``chunk_{n}``.
+        """
+        id_prefix = f"{doc_id}-" if doc_id else "chunk_"
         try:
             if not content_type:
-                content_type = self._detect_mime_type(content)
-                logger.info(f"Detected MIME type: {content_type} for file {filename}")
+                content_type = await self._run_blocking(self._detect_mime_type, content)
+                logger.info("Detected MIME type: %s for file %s", content_type, filename)
 
             # For text files, convert to markdown
-            name, ext = os.path.splitext(filename)
-            if ext.lower() == '.txt':
-                logger.info(f"Converting .txt to .md for processing: {filename}")
-                filename = name + ".md"
+            dot = filename.rfind(".")
+            ext = filename[dot:].lower() if dot != -1 else ""
+            new_ext = _EXT_REWRITE.get(ext)
+            if new_ext:
+                logger.info("Converting %s to %s for processing: %s", ext, new_ext, filename)
+                filename = filename[:dot] + new_ext
 
             # Create document stream
             buf = BytesIO(content)
             source = DocumentStream(name=filename, stream=buf)
 
             # Convert document
-            logger.info(f"Converting document: {filename}")
-            result = self.converter.convert(source)
-            
-            if not result or not hasattr(result, 'document'):
+            logger.info("Converting document: %s", filename)
+            loop = asyncio.get_running_loop()
+            doc = await loop.run_in_executor(get_converter_pool(), _convert_sync, source)
+
+            if doc is None:
                 raise ValueError(f"Failed to convert document: {filename}")
 
-            doc = result.document
-            markdown_content = doc.export_to_markdown()
-            logger.debug(f"Markdown content length: {len(markdown_content)}")
+            markdown_content = await self._run_blocking(doc.export_to_markdown)
+            logger.debug("Markdown content length: %d", len(markdown_content))
             
             strategy = chunking_strategy or self.default_strategy
             chunks = []
@@ -211,36 +558,21 @@ class DoclingService:
             try:
                 if strategy == ChunkingStrategy.HYBRID:
                     # Use Docling's HybridChunker
-                    chunker = HybridChunker(
-                        tokenizer="BAAI/bge-small-en-v1.5",
-                        chunk_size=self.chunk_size,
-                        chunk_overlap=self.chunk_overlap
+                    chunker = _get_hybrid_chunker(
+                        settings.TOKENIZER_NAME,
+                        self.chunk_size,
+                        self.chunk_overlap
                     )
-                    chunk_results = list(chunker.chunk(doc))
-                    logger.debug(f"Created {len(chunk_results)} chunks using HybridChunker")
-                    
-                    for i, chunk in enumerate(chunk_results, 1):
-                        logger.debug(f"Processing chunk {i} of type {type(chunk)}")
-                        chunks.append(DocumentChunk(
-                            chunk_id=f"chunk_{i}",
-                            content=chunk.text if hasattr(chunk, 'text') else str(chunk),
-                            page_number=getattr(chunk, 'page_number', 1),
-                            position=None,
-                            metadata={
-                                "headings": getattr(chunk, 'headings', []),
-                                "type": "hybrid_chunk",
-                                "chunk_number": i,
-                                "total_chunks": len(chunk_results),
-                                "strategy": strategy
-                            }
-                        ))
+                    chunks = await self._run_blocking(_build_hybrid_chunks, chunker, doc, strategy, id_prefix)
+                    logger.debug("Created %d chunks using HybridChunker", len(chunks))
                 
                 elif strategy == ChunkingStrategy.MARKDOWN:
                     # Use markdown-based chunking
-                    chunk_results = self._chunk_by_markdown(markdown_content)
-                    for i, chunk in enumerate(chunk_results, 1):
-                        chunks.append(DocumentChunk(
-                            chunk_id=f"chunk_{i}",
+                    chunk_results = await self._run_text_chunker(_chunk_markdown_text, markdown_content)
+                    total = len(chunk_results)
+                    chunks = [
+                        DocumentChunk.model_construct(
+                            chunk_id=f"{id_prefix}{i}",
                             content=chunk["text"],
                             page_number=1,
                             position=None,
@@ -248,37 +580,63 @@ class DoclingService:
                                 "headings": chunk["headings"],
                                 "type": "markdown_chunk",
                                 "chunk_number": i,
-                                "total_chunks": len(chunk_results),
+                                "total_chunks": total,
                                 "strategy": strategy
                             }
-                        ))
+                        )
+                        for i, chunk in enumerate(chunk_results, 1)
+                    ]
                 
                 elif strategy == ChunkingStrategy.SENTENCE:
                     # Use sentence-based chunking
-                    chunk_results = self._chunk_by_sentences(markdown_content)
-                    for i, chunk in enumerate(chunk_results, 1):
-                        chunks.append(DocumentChunk(
-                            chunk_id=f"chunk_{i}",
+                    chunk_results = await self._run_text_chunker(_chunk_sentence_text, markdown_content)
+                    total = len(chunk_results)
+                    chunks = [
+                        DocumentChunk.model_construct(
+                            chunk_id=f"{id_prefix}{i}",
                             content=chunk["text"],
                             page_number=1,
                             position=None,
                             metadata={
                                 "type": "sentence_chunk",
                                 "chunk_number": i,
-                                "total_chunks": len(chunk_results),
+                                "total_chunks": total,
+                                "strategy": strategy
+                            }
+                        )
+                        for i, chunk in enumerate(chunk_results, 1)
+                    ]
+                
+                elif strategy == ChunkingStrategy.RECURSIVE:
+                    # Token-aware recursive splitting with small chunks merged
+                    chunk_results = await self._run_text_chunker(_chunk_recursive_text, markdown_content)
+                    total = len(chunk_results)
+                    chunks = [
+                        DocumentChunk.model_construct(
+                            chunk_id=f"{id_prefix}{i}",
+                            content=chunk["text"],
+                            page_number=1,
+                            position=None,
+                            metadata={
+                                "type": "recursive_chunk",
+                                "token_count": chunk["tokens"],
+                                "chunk_number": i,
+                                "total_chunks": total,
                                 "strategy": strategy
                             }
-                        ))
+                        )
+                        for i, chunk in enumerate(chunk_results, 1)
+                    ]
             
             except Exception as chunk_error:
-                logger.warning(f"Chunking failed with strategy {strategy}: {str(chunk_error)}")
+                logger.warning("Chunking failed with strategy %s: %s", strategy, chunk_error)
                 strategy = ChunkingStrategy.FALLBACK
 
             # Fallback: use full content if no chunks were created
             if not chunks:
-                logger.warning(f"No chunks created, using fallback strategy for {filename}")
-                chunks.append(DocumentChunk(
-                    chunk_id="chunk_1",
+                logger.warning("No chunks created, using fallback strategy for %s", filename)
+                chunks.append(DocumentChunk.model_construct(
+                    chunk_id=f"{id_prefix}1",
                     content=markdown_content,
                     page_number=1,
                     position=None,
@@ -291,9 +649,31 @@ class DoclingService:
                     }
                 ))
 
-            logger.info(f"Processed document {filename} with {len(chunks)} chunks using {strategy} strategy")
+            logger.info("Processed document %s with %d chunks using %s strategy", filename, len(chunks), strategy)
             return chunks
 
         except Exception as e:
-            logger.error(f"Error processing document {filename}: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            logger.error("Error processing document %s: %s", filename, e, exc_info=True)
+            raise
+
+    async def process_documents(
+        self,
+        documents: List[Tuple[bytes, str, Optional[str]]],
+        chunking_strategy: Optional[str] = None,
+        doc_ids: Optional[List[str]] = None
+    ) -> List[Union[List[DocumentChunk], BaseException]]:
+        """Process several (content, filename, content_type) documents concurrently.
+
+        Conversions run side by side on the process pool. Results are returned in
+        input order, with a failed document yielding its exception in place.
+        doc_ids, when given, scopes each document's chunk IDs as in process_document.
+        """
+        if doc_ids is None:
+            doc_ids = [None] * len(documents)
+        return await asyncio.gather(
+            *(
+                self.process_document(content, filename, content_type, chunking_strategy, doc_id)
+                for (content, filename, content_type), doc_id in zip(documents, doc_ids)
+            ),
+            return_exceptions=True
+        )
@@ -1,20 +1,63 @@
 import asyncio
 import logging
 import uuid
-import base64
-from ..models.document import Document, DocumentStatus, DocumentChunk
+from datetime import datetime, UTC
+from typing import Dict, Optional
+from ..models.document import Document, DocumentStatus
 from ..models.job import Job, JobStatus, JobType
 from ..services.document_storage import DocumentStorage
 from ..services.job_storage import JobStorage
+from ..services.docling_service import DoclingService
+from ..services._es import close_es_client
+from ..services._redis import close_redis_pool
+from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+class QueueFullError(Exception):
+    """Raised when the processing queue stays full for longer than SUBMIT_TIMEOUT."""
+
+class BatchQueue(asyncio.Queue):
+    """asyncio.Queue that hands out several items per consumer wakeup."""
+
+    async def get_many(self, max_items: int, timeout: float = 0.0) -> list:
+        """Wait for one item, then take up to max_items, lingering up to timeout seconds for more."""
+        items = [await self.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(items) < max_items:
+            try:
+                items.append(self.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
 class DocumentProcessor:
-    def __init__(self):
-        self.processing_queue = asyncio.Queue()
+    def __init__(self, concurrency_limit: Optional[int] = None):
+        # Bounded so bursts of uploads get backpressure instead of piling up in memory
+        self.processing_queue = BatchQueue(maxsize=settings.PROCESSING_QUEUE_SIZE)
+        self.concurrency_limit = concurrency_limit or settings.MAX_CONCURRENT_JOBS
         self.doc_storage = DocumentStorage()
         self.job_storage = JobStorage()
+        self.docling = DoclingService(
+            chunk_size=settings.MAX_CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP,
+            default_strategy=settings.DEFAULT_CHUNKING_STRATEGY
+        )
         self._stop_event = asyncio.Event()  # Signal to stop processing
+        # Shared by all workers, so batching never raises in-flight conversions past the limit
+        self._conversion_slots = asyncio.Semaphore(self.concurrency_limit)
+        # Set (and dropped) once a submitted document reaches COMPLETED or FAILED
+        self._status_events: Dict[str, asyncio.Event] = {}
         self._processing_task = None  # Store processing task
 
     async def start(self):
@@ -32,112 +75,232 @@ class DocumentProcessor:
         """Stop the document processor gracefully."""
         logger.info("Stopping DocumentProcessor...")
         self._stop_event.set()  # Set the stop event
-        await self.processing_queue.put((None, None))  # Send a stop signal to queue
+        # One stop signal per worker; a full queue means no worker is waiting on get()
+        for _ in range(self.concurrency_limit):
+            try:
+                self.processing_queue.put_nowait((None, None, None))
+            except asyncio.QueueFull:
+                break
 
         if self._processing_task:
             await self._processing_task  # Ensure processing task exits cleanly
             self._processing_task = None
+        self._drop_stop_signals()
         
         # Close storage services
         await self.doc_storage.close()
         await self.job_storage.close()
 
+        # The shared clients are bound to the event loop that first used them, so
+        # release them here; a start() on another loop (each test gets its own)
+        # then opens new ones instead of failing with "Event loop is closed"
+        await close_es_client()
+        await close_redis_pool()
+
         logger.info("DocumentProcessor stopped successfully")
 
+    def _drop_stop_signals(self) -> None:
+        """Remove stop signals left queued by workers that exited without taking theirs.
+
+        The queue outlives stop(), so a later start() would otherwise lose
+        workers to them; queued documents stay for the next start().
+        """
+        pending = []
+        while True:
+            try:
+                item = self.processing_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.processing_queue.task_done()
+            if item[0] is not None:
+                pending.append(item)
+        for item in pending:
+            self.processing_queue.put_nowait(item)
+
     async def submit_document(self, content: bytes, filename: str, content_type: str):
         """Submit a new document for processing."""
         
         # Encode bytes content as Base64 string
-        encoded_content = base64.b64encode(content).decode("utf-8")
+        encoded_content = Document.encode_bytes(content)
+
+        # One timestamp for both records instead of four default_factory calls
+        now = datetime.now(UTC)
 
         document = Document(
             doc_id=str(uuid.uuid4()),  # Generate a unique ID
             filename=filename,
             content_type=content_type,
             content=encoded_content,  # ✅ Store as a string, not bytes
-            status=DocumentStatus.PENDING
+            status=DocumentStatus.PENDING,
+            created_at=now,
+            updated_at=now
         )
 
         job = Job(
             job_id=str(uuid.uuid4()),  # Generate a unique job ID
             job_type=JobType.DOCUMENT_PROCESSING,
-            status=JobStatus.QUEUED
+            status=JobStatus.QUEUED,
+            created_at=now,
+            updated_at=now
         )
 
-        # Store document and job in their respective databases
-        await self.doc_storage.add_document(document)
-        await self.job_storage.add_job(job)
+        # Store document and job in their respective databases; the writes are
+        # independent, so overlap their round-trips
+        await asyncio.gather(
+            self.doc_storage.add_document(document),
+            self.job_storage.add_job(job)
+        )
 
-        # Add to the processing queue
-        await self.processing_queue.put((document, job))
+        self._status_events[document.doc_id] = asyncio.Event()
+
+        # Queue the raw bytes alongside the document so workers never decode the stored copy
+        try:
+            await asyncio.wait_for(
+                self.processing_queue.put((document, job, content)),
+                timeout=settings.SUBMIT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            error = "Processing queue is full"
+            await self.doc_storage.update_document_status(document.doc_id, DocumentStatus.FAILED, error)
+            await self.job_storage.update_job_status(job.job_id, JobStatus.FAILED, error)
+            self._signal_done(document.doc_id)
+            raise QueueFullError(error)
 
         return document
 
     async def _process_queue(self):
-        """Background task that processes documents from the queue."""
+        """Run concurrency_limit workers that share the processing queue."""
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency_limit)))
+
+    async def _worker(self):
+        """Background worker that processes batches of documents from the queue."""
         while not self._stop_event.is_set():
             try:
-                document, job = await self.processing_queue.get()
-                
-                if document is None:  # Check for stop signal
-                    logger.info("Received stop signal. Exiting queue processing.")
-                    break
+                items = await self.processing_queue.get_many(
+                    settings.BATCH_SIZE,
+                    settings.QUEUE_BATCH_TIMEOUT
+                )
+            except asyncio.CancelledError:
+                logger.info("Processing task was cancelled.")
+                break  # Graceful exit on cancellation
 
-                await self._process_document(document, job)
-                self.processing_queue.task_done()  # Only call task_done() if we processed a document
+            batch = [item for item in items if item[0] is not None]
+            try:
+                if batch:
+                    await self._process_batch(batch)
 
             except asyncio.CancelledError:
                 logger.info("Processing task was cancelled.")
-                break  # Graceful exit on cancellation
+                break
 
             except Exception as e:
-                logger.error(f"Error processing document: {str(e)}", exc_info=True)
+                logger.error("Error processing document batch: %s", e, exc_info=True)
+                for document, _, _ in batch:
+                    self._signal_done(document.doc_id)
 
-    async def _process_document(self, document, job):
-        """Simulated document processing logic."""
-        try:
-            logger.info(f"Processing document: {document.filename}")
-            await asyncio.sleep(2)  # Simulate processing time
+            finally:
+                for _ in items:
+                    self.processing_queue.task_done()
 
-            # 🔹 Ensure chunks are created
-            document.chunks = [
-                DocumentChunk(
-                    chunk_id=str(uuid.uuid4()),
-                    content="This is a processed chunk",
-                    page_number=1,
-                    position={"start": 0, "end": 100},
-                    metadata={}
+            stop_signals = len(items) - len(batch)
+            if stop_signals:  # Check for stop signal
+                # Hand back the signals meant for the other workers
+                for _ in range(stop_signals - 1):
+                    try:
+                        self.processing_queue.put_nowait((None, None, None))
+                    except asyncio.QueueFull:
+                        break
+                logger.info("Received stop signal. Exiting queue processing.")
+                break
+
+    async def _process_batch(self, batch) -> None:
+        """Convert and chunk a batch of (document, job, content) items side by side."""
+        logger.info("Processing batch of %d documents", len(batch))
+        await asyncio.gather(*(
+            self._convert_and_store(document, job, content)
+            for document, job, content in batch
+        ))
+
+    async def _convert_and_store(self, document, job, content) -> None:
+        """Convert one document and store its result as soon as it is ready.
+
+        Each item finishes on its own, so a quick text file is not held back by
+        the slowest PDF in its batch.
+        """
+        async with self._conversion_slots:
+            try:
+                result = await self.docling.process_document(
+                    content,
+                    document.filename,
+                    document.content_type,
+                    doc_id=document.doc_id
                 )
-            ]
+            except Exception as e:
+                result = e
+        await self._process_document(document, job, result)
 
-            # 🔹 Ensure document chunks are updated in storage
-            await self.doc_storage.update_document(document)
+    async def _process_document(self, document, job, result) -> None:
+        """Store the chunks (or the conversion error) for one processed document."""
+        try:
+            if isinstance(result, BaseException):
+                raise result
 
-            # 🔹 Mark as completed
+            # 🔹 Ensure chunks are created
+            document.chunks = result
+
+            # 🔹 Append chunks and mark as completed in a single storage write
             document.status = DocumentStatus.COMPLETED
             job.status = JobStatus.COMPLETED
 
-            await self.doc_storage.update_document_status(document.doc_id, document.status)
+            await self.doc_storage.add_chunks(document.doc_id, document.chunks, document.status)
             await self.job_storage.update_job_status(job.job_id, job.status)
 
-            logger.info(f"Document processing completed: {document.filename}")
+            logger.info("Document processing completed: %s", document.filename)
 
         except Exception as e:
             document.status = DocumentStatus.FAILED
             job.status = JobStatus.FAILED
             document.error_message = str(e)
 
-            await self.doc_storage.update_document_status(document.doc_id, document.status)
-            await self.job_storage.update_job_status(job.job_id, job.status)
-            logger.error(f"Document processing failed: {document.filename}. Error: {e}")
+            await self.doc_storage.update_document_status(document.doc_id, document.status, document.error_message)
+            await self.job_storage.update_job_status(job.job_id, job.status, document.error_message)
+            logger.error("Document processing failed: %s. Error: %s", document.filename, e)
+
+        finally:
+            self._signal_done(document.doc_id)
+
+    def _signal_done(self, doc_id: str) -> None:
+        """Wake wait_for_completion callers; the terminal status is already stored."""
+        event = self._status_events.pop(doc_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_completion(self, doc_id: str, timeout: Optional[float] = None) -> Optional[DocumentStatus]:
+        """Wait until a document submitted here is COMPLETED or FAILED, then return its status.
 
-    async def _chunk_document(self, document: Document):
-        """Chunk document content into smaller parts"""
+        Returns the current status on timeout, or straight away for documents
+        that are not in flight on this processor.
+        """
+        event = self._status_events.get(doc_id)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return await self.get_document_status(doc_id)
+
+    async def _chunk_document(self, document: Document, content: Optional[bytes] = None):
+        """Chunk document content into smaller parts.
+
+        Pass the raw upload bytes when they are at hand to skip the base64 decode.
+        """
         chunk_size = 100  # Adjust as needed
-        content_str = document.decode_content().decode("utf-8")  # Ensure it's a string
-        
+        raw = content if content is not None else document.decode_content()
+        content_str = raw.decode("utf-8") if isinstance(raw, bytes) else raw  # Ensure it's a string
+        doc_id = document.doc_id
+
         chunks = [
-            {"chunk_id": f"{document.doc_id}-{i}", "content": content_str[i:i+chunk_size]}
+            {"chunk_id": f"{doc_id}-{i}", "content": content_str[i:i + chunk_size]}
             for i in range(0, len(content_str), chunk_size)
         ]
         
@@ -1,47 +1,34 @@
-from elasticsearch import AsyncElasticsearch
-from typing import Optional
-import json
+from typing import List, Optional
 from datetime import datetime, UTC
-import redis
 
 from ..models.document import Document, DocumentStatus, DocumentChunk
-from ..config.settings import settings
+from ._es import get_es_client, index_settings, bulk_load, bulk_index
+from ._redis import get_redis
 from ..utils.logging import logger
 
 class DocumentStorage:
     def __init__(self):
-         # Ensure scheme is explicitly added
-        es_host = settings.ELASTICSEARCH_HOST
-        if not es_host.startswith("http://") and not es_host.startswith("https://"):
-            scheme = "https" if settings.ELASTICSEARCH_USE_SSL else "http"
-            es_host = f"{scheme}://{es_host}"
-        
-        self.es = AsyncElasticsearch(
-            hosts=[f"{es_host}:{settings.ELASTICSEARCH_PORT}"],
-            basic_auth=(
-                settings.ELASTICSEARCH_USERNAME,
-                settings.ELASTICSEARCH_PASSWORD
-            ) if settings.ELASTICSEARCH_USERNAME else None
-        )
-        self.redis = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
-            decode_responses=True
-        )
+        self.es = get_es_client()
+        self.redis = get_redis()
         self.index_name = "documents"
     
     async def initialize(self):
+        # The shared clients are released on stop, so a restart has to take the fresh ones
+        self.es = get_es_client()
+        self.redis = get_redis()
         if not await self.es.indices.exists(index=self.index_name):
             await self.create_index()
     
     async def create_index(self):
         settings = {
+            "settings": index_settings(),
             "mappings": {
                 "properties": {
                     "doc_id": {"type": "keyword"},
                     "filename": {"type": "keyword"},
                     "content_type": {"type": "keyword"},
+                    # Base64 document body: stored as a blob, never analyzed as text
+                    "content": {"type": "binary"},
                     "status": {"type": "keyword"},
                     "chunks": {
                         "type": "nested",
@@ -64,31 +51,46 @@ class DocumentStorage:
         logger.info(f"Created index: {self.index_name}")
     
     async def add_document(self, document: Document) -> None:
-        doc = document.model_dump()
-        doc["created_at"] = doc["created_at"].isoformat()
-        doc["updated_at"] = doc["updated_at"].isoformat()
-        
+        # Serialize once, straight from the model; the ES client forwards
+        # pre-encoded bodies as-is and Redis stores the same payload
+        payload = document.model_dump_json()
+
         # Store in Elasticsearch
         await self.es.index(
             index=self.index_name,
             id=document.doc_id,
-            body=doc
+            body=payload
         )
         
         # Cache in Redis with 1-hour expiry
-        self.redis.setex(
+        await self.redis.setex(
             f"doc:{document.doc_id}",
             3600,  # 1 hour
-            json.dumps(doc)
+            payload
         )
         logger.info(f"Stored document: {document.doc_id}")
     
+    async def store_documents(self, documents: List[Document]) -> None:
+        """Index many documents with bulk requests and cache them in one Redis pipeline."""
+        if not documents:
+            return
+        payloads = [(document.doc_id, document.model_dump_json()) for document in documents]
+
+        async with bulk_load(self.es, self.index_name, len(payloads)):
+            await bulk_index(self.es, self.index_name, payloads)
+
+        pipe = self.redis.pipeline(transaction=False)
+        for doc_id, payload in payloads:
+            pipe.setex(f"doc:{doc_id}", 3600, payload)
+        await pipe.execute()
+        logger.info(f"Stored {len(payloads)} documents")
+
     async def update_document(self, document: Document) -> None:
         """Update a document's details in storage, including its chunks."""
         update_data = {
             "doc": {
                 "status": document.status,
-                "updated_at": datetime.now(UTC).isoformat(),
+                "updated_at": datetime.now(UTC),
                 "chunks": [chunk.model_dump() for chunk in document.chunks],
             }
         }
@@ -100,45 +102,73 @@ class DocumentStorage:
             body=update_data
         )
 
-        # 🔹 Update Redis cache
-        cached = self.redis.get(f"document:{document.doc_id}")
-        if cached:
-            doc_data = json.loads(cached)
-            doc_data.update(update_data["doc"])
-            self.redis.setex(
-                f"document:{document.doc_id}",
-                3600,  # 1 hour
-                json.dumps(doc_data)
-            )
+        # 🔹 Invalidate the Redis cache; the next read goes to Elasticsearch
+        await self.redis.unlink(f"doc:{document.doc_id}")
 
         logger.info(f"Updated document: {document.doc_id}")
 
+    async def add_chunks(
+        self,
+        doc_id: str,
+        chunks: List[DocumentChunk],
+        status: Optional[DocumentStatus] = None
+    ) -> None:
+        """Append chunks to a stored document, optionally setting its status in the same write."""
+        params = {
+            "chunks": [chunk.model_dump() for chunk in chunks],
+            "updated_at": datetime.now(UTC),
+            "status": status
+        }
+
+        # 🔹 Append in place so the rest of the document is not resent
+        await self.es.update(
+            index=self.index_name,
+            id=doc_id,
+            body={
+                "script": {
+                    "lang": "painless",
+                    "source": (
+                        "if (ctx._source.chunks == null) { ctx._source.chunks = params.chunks; }"
+                        " else { ctx._source.chunks.addAll(params.chunks); }"
+                        " ctx._source.updated_at = params.updated_at;"
+                        " if (params.status != null) { ctx._source.status = params.status; }"
+                    ),
+                    "params": params
+                }
+            }
+        )
+
+        # 🔹 Invalidate the Redis cache; the next read goes to Elasticsearch
+        await self.redis.unlink(f"doc:{doc_id}")
+
+        logger.info(f"Added {len(chunks)} chunks to document: {doc_id}")
+
     async def get_document(self, doc_id: str) -> Optional[Document]:
         # Try Redis cache first
-        cached = self.redis.get(f"document:{doc_id}")
+        cached = await self.redis.get(f"doc:{doc_id}")
         if cached:
             logger.info(f"Retrieved document from cache: {doc_id}")
-            data = json.loads(cached)
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-            data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-            data["chunks"] = [DocumentChunk(**chunk) for chunk in data.get("chunks", [])]  # 🔹 Ensure chunks are retrieved
-            return Document(**data)
+            # Parse the cached JSON straight into the model in one pass
+            return Document.model_validate_json(cached)
 
         # Fallback to Elasticsearch
         try:
             doc = await self.es.get(index=self.index_name, id=doc_id)
             if doc["found"]:
                 logger.info(f"Retrieved document from Elasticsearch: {doc_id}")
-                data = doc["_source"]
-                data["created_at"] = datetime.fromisoformat(data["created_at"])
-                data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-                data["chunks"] = [DocumentChunk(**chunk) for chunk in data.get("chunks", [])]  # 🔹 Ensure chunks are retrieved
-                return Document(**data)
+                return Document.model_validate(doc["_source"])
         except Exception as e:
             logger.error(f"Error retrieving document {doc_id}: {str(e)}")
 
         return None
 
+    async def get_documents(self, doc_ids: List[str]) -> List[Document]:
+        """Fetch many documents from Elasticsearch in one mget; missing ids are skipped."""
+        if not doc_ids:
+            return []
+        response = await self.es.mget(index=self.index_name, body={"ids": doc_ids})
+        return [Document.model_validate(doc["_source"]) for doc in response["docs"] if doc.get("found")]
+
     
     async def update_document_status(
         self,
@@ -149,7 +179,7 @@ class DocumentStorage:
         update_body = {
             "doc": {
                 "status": status,
-                "updated_at": datetime.now(UTC).isoformat(),
+                "updated_at": datetime.now(UTC),
                 "error_message": error_message
             }
         }
@@ -161,19 +191,11 @@ class DocumentStorage:
             body=update_body
         )
         
-        # Update Redis if cached
-        cached = self.redis.get(f"doc:{doc_id}")
-        if cached:
-            doc_data = json.loads(cached)
-            doc_data.update(update_body["doc"])
-            self.redis.setex(
-                f"doc:{doc_id}",
-                3600,  # 1 hour
-                json.dumps(doc_data)
-            )
+        # Invalidate the cached copy instead of rewriting it
+        await self.redis.unlink(f"doc:{doc_id}")
         
         logger.info(f"Updated document status: {doc_id} -> {status}")
     
     async def close(self):
-        await self.es.close()
-        self.redis.close()
+        # The clients are shared; DocumentProcessor.stop() releases them
+        await self.redis.aclose()
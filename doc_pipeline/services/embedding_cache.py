@@ -1,38 +1,87 @@
-import json
-from typing import List, Optional
-import redis
-from ..config.settings import settings
+from typing import Dict, List, Optional
+import msgspec
+import numpy as np
+from ._redis import get_redis
 from ..models.document import DocumentEmbedding
 
+# Entries are msgpack maps whose vector is packed float32 bytes: 3KB for a
+# 768-dim embedding instead of 9 bytes per msgpack float, and decoded with one
+# frombuffer instead of a per-element parse
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder()
+
+def _encode(embedding: DocumentEmbedding) -> bytes:
+    data = embedding.model_dump()
+    data["embedding"] = np.asarray(data["embedding"], dtype=np.float32).tobytes()
+    return _encoder.encode(data)
+
+def _decode(data: bytes) -> Optional[DocumentEmbedding]:
+    """Decode a cached entry, or return None for one this format cannot read.
+
+    JSON entries written before the msgpack format live out their TTL as cache
+    misses, and are overwritten when the chunk is embedded again.
+    """
+    try:
+        fields = _decoder.decode(data)
+    except msgspec.DecodeError:
+        return None
+    vector = fields["embedding"]
+    # Packed float32 vectors; entries from before float32 packing hold a list and are used as is
+    if isinstance(vector, bytes):
+        fields["embedding"] = np.frombuffer(vector, dtype=np.float32).tolist()
+    # Entries are only ever written by _encode, so skip re-validating the vector
+    return DocumentEmbedding.model_construct(**fields)
+
 class EmbeddingCache:
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            password=settings.REDIS_PASSWORD,
-            decode_responses=True
-        )
+        self.redis_client = get_redis()
         
     def _get_cache_key(self, chunk_id: str, provider: str) -> str:
         return f"embedding:{provider}:{chunk_id}"
     
     async def get_embedding(self, chunk_id: str, provider: str) -> Optional[DocumentEmbedding]:
         cache_key = self._get_cache_key(chunk_id, provider)
-        cached_data = self.redis_client.get(cache_key)
+        cached_data = await self.redis_client.get(cache_key)
         
         if cached_data:
-            data = json.loads(cached_data)
-            return DocumentEmbedding(**data)
+            return _decode(cached_data)
         return None
     
+    async def get_embeddings(self, chunk_ids: List[str], provider: str) -> Dict[str, DocumentEmbedding]:
+        """Fetch cached embeddings for many chunks in one MGET; misses are left out."""
+        if not chunk_ids:
+            return {}
+        cache_keys = [self._get_cache_key(chunk_id, provider) for chunk_id in chunk_ids]
+        cached_values = await self.redis_client.mget(cache_keys)
+
+        decoded = (
+            (chunk_id, _decode(cached_data))
+            for chunk_id, cached_data in zip(chunk_ids, cached_values)
+            if cached_data
+        )
+        return {chunk_id: embedding for chunk_id, embedding in decoded if embedding is not None}
+
     async def store_embedding(self, embedding: DocumentEmbedding) -> None:
         cache_key = self._get_cache_key(embedding.chunk_id, embedding.embedding_provider)
-        self.redis_client.set(
+        await self.redis_client.set(
             cache_key,
-            embedding.model_dump_json(),
+            _encode(embedding),
             ex=86400  # Cache for 24 hours
         )
     
+    async def store_embeddings(self, embeddings: List[DocumentEmbedding]) -> None:
+        """Cache many embeddings in a single pipelined round-trip."""
+        if not embeddings:
+            return
+        pipe = self.redis_client.pipeline(transaction=False)
+        for embedding in embeddings:
+            pipe.set(
+                self._get_cache_key(embedding.chunk_id, embedding.embedding_provider),
+                _encode(embedding),
+                ex=86400  # Cache for 24 hours
+            )
+        await pipe.execute()
+
     async def delete_embedding(self, chunk_id: str, provider: str) -> None:
         cache_key = self._get_cache_key(chunk_id, provider)
-        self.redis_client.delete(cache_key)
\ No newline at end of file
+        await self.redis_client.delete(cache_key)
\ No newline at end of file
@@ -1,22 +1,27 @@
 from typing import List, Dict, Optional, Tuple
 import aiohttp
 import asyncio
+import gzip
+import orjson
 from datetime import datetime, UTC
 import logging
 from prometheus_client import Counter, Histogram
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ..models.document import DocumentChunk, DocumentEmbedding
-from ..config.settings import settings
+from ..config.settings import settings, EMBEDDING_BATCH_SIZE
+from ..utils.metrics import _get_or_create
 from .embedding_cache import EmbeddingCache
 
 # Prometheus metrics
-EMBEDDING_REQUESTS = Counter(
+EMBEDDING_REQUESTS = _get_or_create(
+    Counter,
     'embedding_requests_total',
     'Total number of embedding requests',
     ['provider', 'status']
 )
-EMBEDDING_LATENCY = Histogram(
+EMBEDDING_LATENCY = _get_or_create(
+    Histogram,
     'embedding_latency_seconds',
     'Time spent generating embeddings',
     ['provider']
@@ -35,26 +40,51 @@ class BaseEmbeddingProvider:
         self.api_url = api_url
         self.api_key = api_key
         self.model_name = model_name
-        self.session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        # Built once; only the texts change between requests
+        self._headers = self._get_headers()
+        self._payload_template = self._get_payload_template()
+        self.compress_requests = settings.EMBEDDING_GZIP_REQUESTS
+        if self.compress_requests:
+            self._headers = {**self._headers, "Content-Encoding": "gzip"}
         
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        return self.session
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the provider's long-lived session, creating it on first use.
+
+        The lock keeps concurrent first requests from each opening a session
+        (and connection pool) of their own.
+        """
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    # Pooled keep-alive connections so chunks do not each pay a TCP/TLS handshake
+                    connector = aiohttp.TCPConnector(
+                        limit=settings.EMBEDDING_HTTP_POOL,
+                        keepalive_timeout=60,
+                        ttl_dns_cache=300
+                    )
+                    self._session = aiohttp.ClientSession(
+                        connector=connector,
+                        timeout=aiohttp.ClientTimeout(total=settings.EMBEDDING_HTTP_TIMEOUT)
+                    )
+        return self._session
         
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=(aiohttp.ClientError, EmbeddingError),
+        retry=retry_if_exception_type((aiohttp.ClientError, EmbeddingError)),
         retry_error_callback=lambda retry_state: None  # Return None on final attempt
     )
-    async def _make_request(self, text: str) -> Dict:
-        session = await self._get_session()
-        headers = self._get_headers()
-        payload = self._get_payload(text)
+    async def _post(self, payload: Dict) -> Dict:
+        session = await self._ensure_session()
+        body = orjson.dumps(payload)
+        if self.compress_requests:
+            body = gzip.compress(body, compresslevel=6)
         
         try:
-            async with session.post(self.api_url, json=payload, headers=headers) as response:
+            # aiohttp already advertises gzip/deflate and decodes compressed responses
+            async with session.post(self.api_url, data=body, headers=self._headers) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise EmbeddingError(
@@ -62,47 +92,89 @@ class BaseEmbeddingProvider:
                         self.model_name,
                         response.status
                     )
-                return await response.json()
+                return await response.json(loads=orjson.loads)
         except aiohttp.ClientError as e:
             raise EmbeddingError(
                 f"Network error while generating embedding: {str(e)}",
                 self.model_name
             )
     
+    async def _make_request(self, text: str) -> Dict:
+        return await self._post(self._get_payload(text))
+    
     async def generate_embedding(self, text: str) -> List[float]:
         result = await self._make_request(text)
         return self._parse_response(result)
     
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, in input order.
+
+        Providers whose API takes a list of inputs override _get_batch_payload
+        and _parse_batch_response to do this in one request; the base provider
+        falls back to one concurrent request per text.
+        """
+        if not texts:
+            return []
+        payload = self._get_batch_payload(texts)
+        if payload is None:
+            return list(await asyncio.gather(*(self.generate_embedding(text) for text in texts)))
+        
+        result = await self._post(payload)
+        if result is None:  # Retries exhausted
+            raise EmbeddingError("Failed to generate embeddings after retries", self.model_name)
+        embeddings = self._parse_batch_response(result)
+        if len(embeddings) != len(texts):
+            raise EmbeddingError(
+                f"Expected {len(texts)} embeddings, got {len(embeddings)}",
+                self.model_name
+            )
+        return embeddings
+    
     def _get_headers(self) -> Dict[str, str]:
         return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
     
+    def _get_payload_template(self) -> Dict:
+        return {"model": self.model_name}
+    
     def _get_payload(self, text: str) -> Dict:
-        return {
-            "text": text,
-            "model": self.model_name
-        }
+        return {**self._payload_template, "text": text}
     
     def _parse_response(self, response: Dict) -> List[float]:
         return response["embedding"]
     
+    def _get_batch_payload(self, texts: List[str]) -> Optional[Dict]:
+        return None  # No batch endpoint
+    
+    def _parse_batch_response(self, response: Dict) -> List[List[float]]:
+        raise NotImplementedError
+    
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
 class NomicEmbeddingProvider(BaseEmbeddingProvider):
-    def _get_payload(self, text: str) -> Dict:
+    def _get_payload_template(self) -> Dict:
         return {
-            "texts": [text],  # Nomic expects a list of texts
             "model": self.model_name,
             "task_type": "search"  # Optimize for search
         }
     
+    def _get_payload(self, text: str) -> Dict:
+        return {**self._payload_template, "texts": [text]}  # Nomic expects a list of texts
+    
     def _parse_response(self, response: Dict) -> List[float]:
         # Nomic returns a list of embeddings, we take the first one
         return response["embeddings"][0]
+    
+    def _get_batch_payload(self, texts: List[str]) -> Dict:
+        return {**self._payload_template, "texts": texts}
+    
+    def _parse_batch_response(self, response: Dict) -> List[List[float]]:
+        return response["embeddings"]
 
 class GraniteEmbeddingProvider(BaseEmbeddingProvider):
     def _get_headers(self) -> Dict[str, str]:
@@ -111,15 +183,26 @@ class GraniteEmbeddingProvider(BaseEmbeddingProvider):
             "Content-Type": "application/json"
         }
     
-    def _get_payload(self, text: str) -> Dict:
+    def _get_payload_template(self) -> Dict:
         return {
-            "input": text,
             "model": self.model_name,
             "encoding_format": "float"  # Ensure we get float values
         }
     
+    def _get_payload(self, text: str) -> Dict:
+        return {**self._payload_template, "input": text}
+    
     def _parse_response(self, response: Dict) -> List[float]:
         return response["data"][0]["embedding"]  # Granite has a different response structure
+    
+    def _get_batch_payload(self, texts: List[str]) -> Dict:
+        return {**self._payload_template, "input": texts}  # "input" also accepts an array of texts
+    
+    def _parse_batch_response(self, response: Dict) -> List[List[float]]:
+        data = response["data"]
+        if all("index" in item for item in data):
+            data = sorted(data, key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
 
 class EmbeddingService:
     def __init__(self):
@@ -137,26 +220,23 @@ class EmbeddingService:
         }
         self.cache = EmbeddingCache()
         self.cache.cache_ttl = settings.EMBEDDING_CACHE_TTL
+        self._inflight = asyncio.Semaphore(settings.EMBEDDING_MAX_INFLIGHT)
         
-    async def _generate_single_embedding(
+    async def _embed_chunk(
         self,
         chunk: DocumentChunk,
         provider_name: str,
         provider: BaseEmbeddingProvider
-    ) -> Tuple[DocumentEmbedding, bool]:
-        # Check cache first
-        cached_embedding = await self.cache.get_embedding(chunk.chunk_id, provider_name)
-        if cached_embedding:
-            EMBEDDING_REQUESTS.labels(provider=provider_name, status="cache_hit").inc()
-            return cached_embedding, True
-            
-        # Generate new embedding
+    ) -> DocumentEmbedding:
+        """Call the provider for one chunk; cache lookups and writes are left to the caller."""
         start_time = datetime.now(UTC)
         try:
             embedding = await provider.generate_embedding(chunk.content)
             EMBEDDING_REQUESTS.labels(provider=provider_name, status="success").inc()
             
-            doc_embedding = DocumentEmbedding(
+            # Provider JSON already decodes to a list of floats; validating
+            # every element again would box and copy the whole vector
+            doc_embedding = DocumentEmbedding.model_construct(
                 chunk_id=chunk.chunk_id,
                 embedding_provider=provider_name,
                 embedding=embedding,
@@ -166,19 +246,67 @@ class EmbeddingService:
                 }
             )
             
-            # Cache the result
-            await self.cache.store_embedding(doc_embedding)
-            
             # Record latency
             latency = (datetime.now(UTC) - start_time).total_seconds()
             EMBEDDING_LATENCY.labels(provider=provider_name).observe(latency)
             
-            return doc_embedding, False
+            return doc_embedding
             
         except Exception as e:
             EMBEDDING_REQUESTS.labels(provider=provider_name, status="error").inc()
             logger.error(f"Error generating embedding for chunk {chunk.chunk_id}: {str(e)}")
             raise
+
+    async def _embed_batch(
+        self,
+        chunks: List[DocumentChunk],
+        provider_name: str,
+        provider: BaseEmbeddingProvider
+    ) -> List[DocumentEmbedding]:
+        """Embed several chunks with one provider call; cache I/O is left to the caller."""
+        start_time = datetime.now(UTC)
+        try:
+            embeddings = await provider.generate_embeddings_batch([chunk.content for chunk in chunks])
+            EMBEDDING_REQUESTS.labels(provider=provider_name, status="success").inc(len(chunks))
+        except Exception:
+            EMBEDDING_REQUESTS.labels(provider=provider_name, status="error").inc(len(chunks))
+            raise
+        
+        latency = (datetime.now(UTC) - start_time).total_seconds()
+        EMBEDDING_LATENCY.labels(provider=provider_name).observe(latency)
+        
+        return [
+            DocumentEmbedding.model_construct(
+                chunk_id=chunk.chunk_id,
+                embedding_provider=provider_name,
+                embedding=embedding,
+                metadata={
+                    "model": provider.model_name,
+                    **chunk.metadata
+                }
+            )
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+
+    async def _generate_single_embedding(
+        self,
+        chunk: DocumentChunk,
+        provider_name: str,
+        provider: BaseEmbeddingProvider
+    ) -> Tuple[DocumentEmbedding, bool]:
+        # Check cache first
+        cached_embedding = await self.cache.get_embedding(chunk.chunk_id, provider_name)
+        if cached_embedding:
+            EMBEDDING_REQUESTS.labels(provider=provider_name, status="cache_hit").inc()
+            return cached_embedding, True
+            
+        # Generate new embedding
+        doc_embedding = await self._embed_chunk(chunk, provider_name, provider)
+        
+        # Cache the result
+        await self.cache.store_embedding(doc_embedding)
+        
+        return doc_embedding, False
     
     async def generate_embeddings(
         self,
@@ -186,33 +314,58 @@ class EmbeddingService:
         provider_name: str = "nomic",
         batch_size: Optional[int] = None
     ) -> List[DocumentEmbedding]:
-        batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        batch_size = batch_size or EMBEDDING_BATCH_SIZE
         if provider_name not in self.providers:
             raise ValueError(f"Unknown embedding provider: {provider_name}")
         
         provider = self.providers[provider_name]
-        results = []
         
-        # Process in batches
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
-            tasks = [
-                self._generate_single_embedding(chunk, provider_name, provider)
-                for chunk in batch
-            ]
-            
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for chunk, result in zip(batch, batch_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Failed to generate embedding for chunk {chunk.chunk_id}: {str(result)}")
-                    continue
-                    
-                embedding, was_cached = result
-                results.append(embedding)
+        # One MGET for every chunk up front, so batches are packed with misses only
+        cached = await self.cache.get_embeddings(
+            [chunk.chunk_id for chunk in chunks],
+            provider_name
+        )
+        if cached:
+            EMBEDDING_REQUESTS.labels(provider=provider_name, status="cache_hit").inc(len(cached))
+        misses = [chunk for chunk in chunks if chunk.chunk_id not in cached]
         
+        # Batch chunks of similar length together so providers pad less,
+        # then hand results back in the caller's order
+        by_length = sorted(misses, key=lambda chunk: len(chunk.content))
+        
+        # Submit every batch at once; the semaphore keeps at most
+        # EMBEDDING_MAX_INFLIGHT of them in flight across all callers
+        batch_results = await asyncio.gather(*[
+            self._generate_batch(by_length[i:i + batch_size], provider_name, provider)
+            for i in range(0, len(by_length), batch_size)
+        ])
+        
+        generated = {embedding.chunk_id: embedding for batch in batch_results for embedding in batch}
+        results = []
+        for chunk in chunks:
+            embedding = cached.get(chunk.chunk_id) or generated.get(chunk.chunk_id)
+            if embedding is not None:
+                results.append(embedding)
         return results
     
+    async def _generate_batch(
+        self,
+        batch: List[DocumentChunk],
+        provider_name: str,
+        provider: BaseEmbeddingProvider
+    ) -> List[DocumentEmbedding]:
+        """Embed one batch of cache misses and cache the results; failed batches yield nothing."""
+        async with self._inflight:
+            try:
+                embeddings = await self._embed_batch(batch, provider_name, provider)
+            except Exception as e:
+                logger.error(f"Failed to generate embeddings for {len(batch)} chunks: {str(e)}")
+                return []
+            
+            # Cache the new embeddings in a single pipelined round-trip
+            await self.cache.store_embeddings(embeddings)
+        return embeddings
+    
     async def close(self):
         await asyncio.gather(*[
             provider.close() for provider in self.providers.values()
@@ -1,36 +1,50 @@
-import json
 import hashlib
+from functools import lru_cache
+import msgspec
+import numpy as np
+import orjson
 from typing import List, Dict, Optional
-from datetime import datetime, UTC
-import redis
-from ..config.settings import settings
+from ._redis import get_redis
+
+_SIMHASH_BITS = 64
+_SIMHASH_SEED = 0x5EED
+# Near-duplicate queries share a SimHash bucket; a hit is only served when the
+# cached query is at least this similar to the incoming one
+_MIN_SIMILARITY = 0.999
+
+@lru_cache(maxsize=None)
+def _projection(dim: int) -> np.ndarray:
+    """Fixed random hyperplanes for SimHash, seeded so every process agrees."""
+    rng = np.random.default_rng(_SIMHASH_SEED)
+    return rng.standard_normal((dim, _SIMHASH_BITS), dtype=np.float32)
+
+def _simhash(vector: np.ndarray) -> bytes:
+    """Sign bits of the vector's random projections, packed into 8 bytes."""
+    return np.packbits(vector @ _projection(vector.shape[0]) > 0).tobytes()
+
+def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(a @ b) / denom if denom else 0.0
 
 class SearchCache:
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            password=settings.REDIS_PASSWORD,
-            decode_responses=True
-        )
+        self.redis_client = get_redis()
         self.cache_ttl = 3600  # 1 hour by default
     
     def _get_cache_key(
         self,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         provider: str,
         filters: Optional[Dict] = None,
         k: int = 10
     ) -> str:
-        # Create a deterministic cache key from the search parameters
-        key_parts = [
-            str(query_embedding),
-            provider,
-            str(filters) if filters else "",
-            str(k)
-        ]
-        key_str = "|".join(key_parts)
-        return f"search_cache:{hashlib.sha256(key_str.encode()).hexdigest()}"
+        # Key on the 64-bit SimHash so float jitter between equivalent
+        # queries still lands on the same entry
+        h = hashlib.sha256(_simhash(query_embedding))
+        h.update(provider.encode())
+        h.update(orjson.dumps(filters or {}, option=orjson.OPT_SORT_KEYS))
+        h.update(k.to_bytes(4, "little"))
+        return f"search_cache:{h.hexdigest()}"
     
     async def get_cached_results(
         self,
@@ -39,11 +53,20 @@ class SearchCache:
         filters: Optional[Dict] = None,
         k: int = 10
     ) -> Optional[List[Dict]]:
-        cache_key = self._get_cache_key(query_embedding, provider, filters, k)
-        cached_data = self.redis_client.get(cache_key)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        cache_key = self._get_cache_key(query, provider, filters, k)
+        cached_data = await self.redis_client.get(cache_key)
         
         if cached_data:
-            return json.loads(cached_data)
+            try:
+                entry = msgspec.msgpack.decode(cached_data)
+            except msgspec.DecodeError:
+                # Stale format (e.g. JSON from before msgpack) or corrupt; drop it as a miss
+                await self.redis_client.unlink(cache_key)
+                return None
+            cached_query = np.frombuffer(entry["query"], dtype=np.float32)
+            if cached_query.shape == query.shape and _cosine_similarity(query, cached_query) >= _MIN_SIMILARITY:
+                return entry["results"]
         return None
     
     async def store_results(
@@ -54,19 +77,25 @@ class SearchCache:
         filters: Optional[Dict] = None,
         k: int = 10
     ) -> None:
-        cache_key = self._get_cache_key(query_embedding, provider, filters, k)
-        self.redis_client.setex(
+        query = np.asarray(query_embedding, dtype=np.float32)
+        cache_key = self._get_cache_key(query, provider, filters, k)
+        # Keep the query vector with the results so hits can be verified
+        await self.redis_client.setex(
             cache_key,
             self.cache_ttl,
-            json.dumps(results)
+            msgspec.msgpack.encode({"query": query.tobytes(), "results": results})
         )
     
     async def invalidate_cache(self, pattern: str = "search_cache:*") -> None:
         """Invalidate all search cache entries matching the pattern."""
+        # Large COUNT hint cuts SCAN round-trips; UNLINK frees memory off the
+        # Redis main thread, and the pipeline sends all deletes in one go
+        pipe = self.redis_client.pipeline(transaction=False)
         cursor = 0
         while True:
-            cursor, keys = self.redis_client.scan(cursor, match=pattern)
+            cursor, keys = await self.redis_client.scan(cursor, match=pattern, count=1000)
             if keys:
-                self.redis_client.delete(*keys)
+                pipe.unlink(*keys)
             if cursor == 0:
-                break
\ No newline at end of file
+                break
+        await pipe.execute()
\ No newline at end of file
@@ -1,39 +1,53 @@
-from elasticsearch import AsyncElasticsearch
-from typing import List, Dict, Optional, Literal
+from typing import Any, List, Dict, Optional, Literal, Tuple
+import time
+from array import array
+from collections import OrderedDict
 from datetime import datetime, UTC
 from prometheus_client import Counter, Histogram
 from ..models.document import DocumentEmbedding
 from ..config.settings import settings
+from ..utils.metrics import _get_or_create
+from ._es import get_es_client, index_settings, vector_index_options, bulk_load, bulk_index
 from .search_cache import SearchCache
 
 # Prometheus metrics
-VECTOR_STORE_OPERATIONS = Counter(
+VECTOR_STORE_OPERATIONS = _get_or_create(
+    Counter,
     'vector_store_operations_total',
     'Total number of vector store operations',
     ['operation', 'status']
 )
-VECTOR_SEARCH_LATENCY = Histogram(
+VECTOR_SEARCH_LATENCY = _get_or_create(
+    Histogram,
     'vector_search_latency_seconds',
     'Time spent performing vector search',
     ['provider']
 )
+VECTOR_QUERY_CACHE_HITS = _get_or_create(
+    Counter,
+    'vector_query_cache_hits_total',
+    'Number of vector searches answered from the in-process query cache',
+    ['provider']
+)
+
+# Children with fixed labels are bound once, so call sites skip the label
+# lookup that .labels() does on every call
+_SEARCH_OK = VECTOR_STORE_OPERATIONS.labels(operation="search", status="success")
+_SEARCH_ERROR = VECTOR_STORE_OPERATIONS.labels(operation="search", status="error")
+_INDEX_OK = VECTOR_STORE_OPERATIONS.labels(operation="index", status="success")
+_INDEX_ERROR = VECTOR_STORE_OPERATIONS.labels(operation="index", status="error")
 
 class VectorStorage:
     def __init__(self):
-         # Ensure scheme is explicitly added
-        es_host = settings.ELASTICSEARCH_HOST
-        if not es_host.startswith("http://") and not es_host.startswith("https://"):
-            scheme = "https" if settings.ELASTICSEARCH_USE_SSL else "http"
-            es_host = f"{scheme}://{es_host}"
-        
-        self.es = AsyncElasticsearch(
-            hosts=[f"{es_host}:{settings.ELASTICSEARCH_PORT}"],
-            basic_auth=(
-                settings.ELASTICSEARCH_USERNAME,
-                settings.ELASTICSEARCH_PASSWORD
-            ) if settings.ELASTICSEARCH_USERNAME else None
-        )
+        self.es = get_es_client()
         self.index_name = "document_embeddings"
+        # LRU of recent search results, keyed on (provider, k, float32 query bytes).
+        # Entries also expire, since writes from other processes cannot clear it.
+        self._query_cache: "OrderedDict[Tuple[str, int, bytes], Tuple[float, List[Dict]]]" = OrderedDict()
+        self._query_cache_size = settings.VECTOR_QUERY_CACHE_SIZE
+        self._query_cache_ttl = settings.VECTOR_QUERY_CACHE_TTL
+        # Per-provider (latency, cache hit) children, bound on first search
+        self._provider_metrics: Dict[str, Tuple[Any, Any]] = {}
     
     async def initialize(self):
         if not await self.es.indices.exists(index=self.index_name):
@@ -41,6 +55,7 @@ class VectorStorage:
     
     async def create_index(self):
         settings = {
+            "settings": index_settings(),
             "mappings": {
                 "properties": {
                     "chunk_id": {"type": "keyword"},
@@ -49,7 +64,10 @@ class VectorStorage:
                         "type": "dense_vector",
                         "dims": 768,  # Adjust based on embedding dimension
                         "index": True,
-                        "similarity": "cosine"
+                        "similarity": "cosine",
+                        # int8_hnsw by default: quantized on ingest, ~768 bytes
+                        # per vector instead of 3KB
+                        "index_options": vector_index_options()
                     },
                     "metadata": {"type": "object"},
                     "created_at": {"type": "date"}
@@ -59,12 +77,25 @@ class VectorStorage:
         await self.es.indices.create(index=self.index_name, body=settings)
     
     async def store_embedding(self, embedding: DocumentEmbedding):
-        doc = embedding.dict()
-        await self.es.index(
-            index=self.index_name,
-            id=f"{embedding.chunk_id}_{embedding.embedding_provider}",
-            body=doc
-        )
+        await self.store_embeddings([embedding])
+    
+    async def store_embeddings(self, embeddings: List[DocumentEmbedding]) -> None:
+        """Index many embeddings through the bulk API instead of one request each."""
+        if not embeddings:
+            return
+        async with bulk_load(self.es, self.index_name, len(embeddings)):
+            indexed = await bulk_index(
+                self.es,
+                self.index_name,
+                (
+                    (f"{embedding.chunk_id}_{embedding.embedding_provider}", embedding.model_dump_json())
+                    for embedding in embeddings
+                )
+            )
+        _INDEX_OK.inc(indexed)
+        if indexed < len(embeddings):
+            _INDEX_ERROR.inc(len(embeddings) - indexed)
+        self._query_cache.clear()  # New vectors can change any cached result
     
     async def search_similar(
         self,
@@ -72,32 +103,58 @@ class VectorStorage:
         provider: str,
         k: int = 10
     ) -> List[Dict]:
+        metrics = self._provider_metrics.get(provider)
+        if metrics is None:
+            metrics = self._provider_metrics[provider] = (
+                VECTOR_SEARCH_LATENCY.labels(provider=provider),
+                VECTOR_QUERY_CACHE_HITS.labels(provider=provider)
+            )
+        search_latency, cache_hits = metrics
+        
+        # The raw buffer is an exact key and hashes far faster than a float tuple
+        cache_key = (provider, k, array("f", query_embedding).tobytes())
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            expires_at, results = cached
+            if expires_at > time.monotonic():
+                self._query_cache.move_to_end(cache_key)
+                cache_hits.inc()
+                return list(results)
+            del self._query_cache[cache_key]
+        
+        # Approximate kNN walks the HNSW graph instead of scoring every
+        # document with a cosineSimilarity script
         query = {
-            "query": {
-                "bool": {
-                    "must": [
-                        {
-                            "term": {
-                                "embedding_provider": provider
-                            }
-                        },
-                        {
-                            "script_score": {
-                                "query": {"match_all": {}},
-                                "script": {
-                                    "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
-                                    "params": {"query_vector": query_embedding}
-                                }
-                            }
-                        }
-                    ]
+            "knn": {
+                "field": "embedding",
+                "query_vector": query_embedding,
+                "k": k,
+                "num_candidates": max(settings.ES_KNN_CANDIDATES_FACTOR * k, 100),
+                "filter": {
+                    "term": {
+                        "embedding_provider": provider
+                    }
                 }
             },
             "size": k
         }
         
-        response = await self.es.search(index=self.index_name, body=query)
-        return [hit["_source"] for hit in response["hits"]["hits"]]
+        start = time.perf_counter()
+        try:
+            response = await self.es.search(index=self.index_name, body=query)
+        except Exception:
+            _SEARCH_ERROR.inc()
+            raise
+        search_latency.observe(time.perf_counter() - start)
+        _SEARCH_OK.inc()
+        results = [hit["_source"] for hit in response["hits"]["hits"]]
+        
+        if self._query_cache_size > 0:
+            self._query_cache[cache_key] = (time.monotonic() + self._query_cache_ttl, results)
+            if len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        return list(results)
     
     async def close(self):
-        await self.es.close()
\ No newline at end of file
+        # The Elasticsearch client is shared; close_es_client() releases it on shutdown
+        pass
\ No newline at end of file
@@ -0,0 +1,10 @@
+import asyncio
+try:
+    import uvloop  # Same loop the server runs on; not available on Windows
+except ImportError:
+    uvloop = None
+
+def pytest_asyncio_loop_factories(config, item):
+    if uvloop is None:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
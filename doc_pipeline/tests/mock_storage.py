@@ -1,5 +1,5 @@
-from typing import Dict, Optional
-from ..models.document import Document, DocumentStatus
+from typing import Dict, List, Optional
+from ..models.document import Document, DocumentChunk, DocumentStatus
 from ..models.job import Job, JobStatus
 
 class MockDocumentStorage:
@@ -17,9 +17,23 @@ class MockDocumentStorage:
     async def store_document(self, document: Document) -> None:
         self.documents[document.doc_id] = document
 
+    async def store_documents(self, documents: List[Document]) -> None:
+        for document in documents:
+            self.documents[document.doc_id] = document
+
+    async def add_chunks(self, doc_id: str, chunks: List[DocumentChunk], status: Optional[DocumentStatus] = None) -> None:
+        if doc_id in self.documents:
+            doc = self.documents[doc_id]
+            doc.chunks = doc.chunks + list(chunks)
+            if status is not None:
+                doc.status = status
+
     async def get_document(self, doc_id: str) -> Optional[Document]:
         return self.documents.get(doc_id)
 
+    async def get_documents(self, doc_ids: List[str]) -> List[Document]:
+        return [self.documents[doc_id] for doc_id in doc_ids if doc_id in self.documents]
+
     async def update_document_status(self, doc_id: str, status: DocumentStatus, error_message: Optional[str] = None) -> None:
         if doc_id in self.documents:
             doc = self.documents[doc_id]
@@ -1,5 +1,7 @@
+import re
 import pytest
-from doc_pipeline.services.docling_service import DoclingService, ChunkingStrategy
+from unittest.mock import patch
+from doc_pipeline.services.docling_service import DoclingService, ChunkingStrategy, _chunk_recursive_text
 from doc_pipeline.models.document import DocumentChunk
 from doc_pipeline.utils.logging import logger
 
@@ -72,6 +74,48 @@ async def test_sentence_chunking(docling_service, sample_text):
     assert all(isinstance(chunk, DocumentChunk) for chunk in chunks)
     assert all(chunk.metadata["strategy"] == ChunkingStrategy.SENTENCE for chunk in chunks)
 
+@pytest.mark.asyncio
+async def test_recursive_chunking(docling_service, sample_text):
+    chunks = await docling_service.process_document(
+        content=sample_text.encode('utf-8'),
+        filename="test.md",
+        content_type="text/markdown",
+        chunking_strategy=ChunkingStrategy.RECURSIVE
+    )
+    
+    assert chunks is not None
+    assert len(chunks) > 0
+    assert all(isinstance(chunk, DocumentChunk) for chunk in chunks)
+    assert all(chunk.content for chunk in chunks)
+    assert all(chunk.metadata["strategy"] == ChunkingStrategy.RECURSIVE for chunk in chunks)
+    assert all(chunk.metadata["token_count"] <= docling_service.chunk_size for chunk in chunks)
+
+class WhitespaceCountingTokenizer:
+    """Counts every whitespace character as a token, like some BPE vocabularies,
+    so joined text holds more tokens than its pieces added up."""
+    _TOKEN_RE = re.compile(r'\S+|\s')
+
+    def __call__(self, texts, add_special_tokens=False, verbose=False, return_offsets_mapping=False):
+        if isinstance(texts, str):
+            tokens = list(self._TOKEN_RE.finditer(texts))
+            return {
+                "input_ids": list(range(len(tokens))),
+                "offset_mapping": [(token.start(), token.end()) for token in tokens]
+            }
+        return {"input_ids": [self._TOKEN_RE.findall(text) for text in texts]}
+
+def test_recursive_chunking_remeasures_merged_chunks():
+    tokenizer = WhitespaceCountingTokenizer()
+    content = "delta! beta. alpha\n\n alpha alpha eps " * 20
+    with patch("doc_pipeline.services.docling_service._get_tokenizer", return_value=tokenizer):
+        chunks = _chunk_recursive_text(content, 9)
+
+    assert chunks
+    for chunk in chunks:
+        tokens = len(tokenizer([chunk["text"]])["input_ids"][0])
+        assert tokens <= 9
+        assert chunk["tokens"] <= 9
+
 @pytest.mark.asyncio
 async def test_chunking_with_small_size(docling_service, sample_text):
     small_chunk_service = DoclingService(
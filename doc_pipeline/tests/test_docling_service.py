@@ -1,6 +1,10 @@
+import io
+import zipfile
 import pytest
+from unittest.mock import AsyncMock, patch
 from docling.exceptions import ConversionError
 from ..services.docling_service import DoclingService
+from ..services.embedding_service import EmbeddingService, NomicEmbeddingProvider
 
 @pytest.fixture
 def docling_service():
@@ -15,6 +19,19 @@ def test_mime_type_detection(docling_service):
     text_content = b"This is a test document"
     assert docling_service._detect_mime_type(text_content).startswith('text/plain')
 
+def test_mime_type_signatures(docling_service):
+    assert docling_service._detect_mime_type(b"\x89PNG\r\n\x1a\n") == "image/png"
+    assert docling_service._detect_mime_type(b"<!DOCTYPE html><html></html>") == "text/html"
+
+    # OOXML documents are told apart by their part names
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", "<w:document/>")
+    assert docling_service._detect_mime_type(buf.getvalue()) == (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+
 @pytest.mark.asyncio
 async def test_process_text_document(docling_service):
     # Create a simple text document
@@ -49,6 +66,21 @@ async def test_process_pdf_document(docling_service):
         # Since this is a malformed PDF, we expect it might fail
         assert str(e) is not None
 
+@pytest.mark.asyncio
+async def test_process_multiple_documents(docling_service):
+    documents = [
+        (b"First document.\nWith two lines.", "first.txt", "text/plain"),
+        (b"Some binary content", "test.unknown", "application/octet-stream"),
+        (b"# Heading\n\nThird document.", "third.md", "text/markdown"),
+    ]
+
+    results = await docling_service.process_documents(documents)
+
+    assert len(results) == 3
+    assert results[0] and all(chunk.content for chunk in results[0])
+    assert isinstance(results[1], ConversionError)
+    assert results[2] and all(chunk.content for chunk in results[2])
+
 @pytest.mark.asyncio
 async def test_unsupported_document_type(docling_service):
     content = b"Some binary content"
@@ -90,4 +122,38 @@ Another paragraph here."""
         content, filename, content_type, chunking_strategy="sentence"
     )
     assert len(chunks_sent) > 0
-    assert all(c.metadata["strategy"] == "sentence" for c in chunks_sent)
\ No newline at end of file
+    assert all(c.metadata["strategy"] == "sentence" for c in chunks_sent)
+
+@pytest.mark.asyncio
+async def test_embeddings_of_two_documents_do_not_collide(docling_service):
+    content = b"# Heading\n\nThe same text in two different documents."
+    chunks_a, chunks_b = await docling_service.process_documents(
+        [(content, "a.md", "text/markdown"), (content, "b.md", "text/markdown")],
+        doc_ids=["doc-a", "doc-b"]
+    )
+    ids_a = {chunk.chunk_id for chunk in chunks_a}
+    ids_b = {chunk.chunk_id for chunk in chunks_b}
+    assert ids_a and ids_b
+    assert not ids_a & ids_b
+    assert all(chunk_id.startswith("doc-a-") for chunk_id in ids_a)
+
+    with patch('redis.asyncio.Redis') as mock_redis:
+        client = mock_redis.return_value
+        client.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+        client.pipeline.return_value.execute = AsyncMock()
+        service = EmbeddingService()
+        with patch.object(
+            NomicEmbeddingProvider,
+            'generate_embeddings_batch',
+            new_callable=AsyncMock,
+            side_effect=lambda texts: [[0.5, 0.25]] * len(texts)
+        ):
+            embeddings_a = await service.generate_embeddings(chunks_a, provider_name="nomic")
+            embeddings_b = await service.generate_embeddings(chunks_b, provider_name="nomic")
+
+    # Cache keys and vector index IDs are both derived from the chunk ID
+    cached_keys = [call.args[0] for call in client.pipeline.return_value.set.call_args_list]
+    assert len(cached_keys) == len(set(cached_keys)) == len(chunks_a) + len(chunks_b)
+    index_ids_a = {f"{e.chunk_id}_{e.embedding_provider}" for e in embeddings_a}
+    index_ids_b = {f"{e.chunk_id}_{e.embedding_provider}" for e in embeddings_b}
+    assert not index_ids_a & index_ids_b
@@ -2,14 +2,26 @@ import pytest
 import asyncio
 import pytest_asyncio
 from ..services.document_processor import DocumentProcessor
-from ..models.document import Document, DocumentStatus
+from ..models.document import Document, DocumentChunk, DocumentStatus
 from ..models.job import Job, JobStatus
 import tempfile
 import os
 
+class StubDoclingService:
+    """Returns the whole text as one chunk, so these tests cover the job flow
+    without converter processes; real conversion is tested in test_docling_service."""
+
+    async def process_document(self, content, filename, content_type=None, chunking_strategy=None, doc_id=None):
+        return [DocumentChunk(
+            chunk_id=f"{doc_id}-1",
+            content=content.decode("utf-8"),
+            metadata={"type": "full_document", "strategy": "fallback"}
+        )]
+
 @pytest_asyncio.fixture
 async def document_processor():
     processor = DocumentProcessor()
+    processor.docling = StubDoclingService()
     await processor.start()
     
     try:
@@ -53,13 +65,7 @@ async def test_document_processing(document_processor):
     )
 
     # Wait for processing to complete
-    max_wait = 10  # seconds
-    while max_wait > 0:
-        doc = await document_processor.get_document(document.doc_id)
-        if doc and doc.status in [DocumentStatus.COMPLETED, DocumentStatus.FAILED]:
-            break
-        await asyncio.sleep(1)
-        max_wait -= 1
+    await document_processor.wait_for_completion(document.doc_id, timeout=10)
 
     # Get the processed document
     processed_doc = await document_processor.get_document(document.doc_id)
@@ -87,13 +93,7 @@ async def test_get_document_status(document_processor):
     assert status == DocumentStatus.PENDING
     
     # Wait for processing and check final status
-    max_wait = 10  # seconds
-    while max_wait > 0:
-        status = await document_processor.get_document_status(document.doc_id)
-        if status in [DocumentStatus.COMPLETED, DocumentStatus.FAILED]:
-            break
-        await asyncio.sleep(1)
-        max_wait -= 1
+    await document_processor.wait_for_completion(document.doc_id, timeout=10)
     
     final_status = await document_processor.get_document_status(document.doc_id)
     assert final_status == DocumentStatus.COMPLETED
\ No newline at end of file
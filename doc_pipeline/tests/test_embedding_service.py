@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 import aiohttp
-import json
+import msgspec
+import numpy as np
 from typing import List, Dict, Optional, Union
 from unittest.mock import AsyncMock, patch, MagicMock
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -16,9 +18,13 @@ from ..config.settings import settings
 
 @pytest.fixture
 def mock_redis():
-    with patch('redis.Redis') as mock:
+    with patch('redis.asyncio.Redis') as mock:
         # Configure Redis mock to return None by default (cache miss)
-        mock.return_value.get.return_value = None
+        client = mock.return_value
+        client.get = AsyncMock(return_value=None)
+        client.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+        client.set = AsyncMock()
+        client.pipeline.return_value.execute = AsyncMock()
         yield mock
 
 @pytest.fixture
@@ -60,17 +66,17 @@ async def test_generate_single_embedding_success(embedding_service, sample_chunk
 
 @pytest.mark.asyncio
 async def test_generate_single_embedding_cached(embedding_service, sample_chunks):
-    # Mock cache hit
-    mock_embedding = [0.1, 0.2, 0.3]
+    # Mock cache hit; vectors are cached as float32 bytes, so use exactly representable values
+    mock_embedding = [0.5, 0.25, 0.125]
     mock_cache_data = {
         "chunk_id": "test_chunk_0",
         "embedding_provider": "nomic",
-        "embedding": mock_embedding,
+        "embedding": np.asarray(mock_embedding, dtype=np.float32).tobytes(),
         "metadata": {}
     }
     
     # Configure Redis mock to return cached data
-    embedding_service.cache.redis_client.get.return_value = json.dumps(mock_cache_data)
+    embedding_service.cache.redis_client.get.return_value = msgspec.msgpack.encode(mock_cache_data)
     
     result, was_cached = await embedding_service._generate_single_embedding(
         sample_chunks[0],
@@ -88,28 +94,171 @@ async def test_generate_embeddings_batch(embedding_service, sample_chunks):
     mock_embedding = [0.1, 0.2, 0.3]
     
     with patch.object(
-        BaseEmbeddingProvider,
-        'generate_embedding',
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
         new_callable=AsyncMock,
-        return_value=mock_embedding
-    ):
+        side_effect=lambda texts: [mock_embedding] * len(texts)
+    ) as generate:
         results = await embedding_service.generate_embeddings(
             sample_chunks,
             provider_name="nomic",
             batch_size=2
         )
         
+        assert generate.await_count == 2  # One provider call per batch
+        
         assert len(results) == len(sample_chunks)
         for result, chunk in zip(results, sample_chunks):
             assert result.chunk_id == chunk.chunk_id
             assert result.embedding == mock_embedding
             assert result.embedding_provider == "nomic"
 
+@pytest.mark.asyncio
+async def test_generate_embeddings_batches_run_concurrently(embedding_service, sample_chunks):
+    in_flight = 0
+    max_in_flight = 0
+    
+    async def fake_batch(texts):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [[0.1, 0.2, 0.3]] * len(texts)
+    
+    with patch.object(
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
+        new_callable=AsyncMock,
+        side_effect=fake_batch
+    ):
+        results = await embedding_service.generate_embeddings(
+            sample_chunks,
+            provider_name="nomic",
+            batch_size=1
+        )
+        
+        assert [r.chunk_id for r in results] == [c.chunk_id for c in sample_chunks]
+        assert max_in_flight == len(sample_chunks)  # Batches were dispatched together
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_groups_similar_lengths(embedding_service):
+    lengths = [500, 10, 480, 12, 250, 260]
+    chunks = [
+        DocumentChunk(chunk_id=f"chunk_{i}", content="x" * length)
+        for i, length in enumerate(lengths)
+    ]
+    batches = []
+    
+    async def fake_batch(texts):
+        batches.append(sorted(len(text) for text in texts))
+        return [[0.1, 0.2, 0.3]] * len(texts)
+    
+    with patch.object(
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
+        new_callable=AsyncMock,
+        side_effect=fake_batch
+    ):
+        results = await embedding_service.generate_embeddings(
+            chunks,
+            provider_name="nomic",
+            batch_size=2
+        )
+        
+        assert sorted(batches) == [[10, 12], [250, 260], [480, 500]]
+        assert [r.chunk_id for r in results] == [c.chunk_id for c in chunks]  # Original order restored
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_batch_uses_cache(embedding_service, sample_chunks):
+    mock_embedding = [0.1, 0.2, 0.3]
+    cached_data = msgspec.msgpack.encode({
+        "chunk_id": "test_chunk_1",
+        "embedding_provider": "nomic",
+        "embedding": [0.4, 0.5, 0.6],
+        "metadata": {}
+    })
+    redis_client = embedding_service.cache.redis_client
+    redis_client.mget.side_effect = lambda keys: [
+        cached_data if key.endswith("test_chunk_1") else None for key in keys
+    ]
+    
+    with patch.object(
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
+        new_callable=AsyncMock,
+        side_effect=lambda texts: [mock_embedding] * len(texts)
+    ) as generate:
+        results = await embedding_service.generate_embeddings(
+            sample_chunks,
+            provider_name="nomic"
+        )
+        
+        assert [r.chunk_id for r in results] == [c.chunk_id for c in sample_chunks]
+        assert results[1].embedding == [0.4, 0.5, 0.6]
+        # Only the cache misses reach the provider, in a single call
+        generate.assert_awaited_once_with(["Test content 0", "Test content 2"])
+        redis_client.mget.assert_called_once()
+        redis_client.get.assert_not_called()
+        assert redis_client.pipeline.return_value.set.call_count == 2
+        redis_client.pipeline.return_value.execute.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_treats_legacy_json_entries_as_misses(embedding_service, sample_chunks):
+    mock_embedding = [0.1, 0.2, 0.3]
+    # Entries from before the msgpack format were JSON
+    legacy_data = b'{"chunk_id": "test_chunk_1", "embedding_provider": "nomic", "embedding": [0.4], "metadata": {}}'
+    embedding_service.cache.redis_client.mget.side_effect = lambda keys: [legacy_data] * len(keys)
+    
+    with patch.object(
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
+        new_callable=AsyncMock,
+        side_effect=lambda texts: [mock_embedding] * len(texts)
+    ) as generate:
+        results = await embedding_service.generate_embeddings(
+            sample_chunks,
+            provider_name="nomic"
+        )
+        
+        assert all(r.embedding == mock_embedding for r in results)
+        generate.assert_awaited_once_with([c.content for c in sample_chunks])
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_packs_misses_into_batches(embedding_service, sample_chunks):
+    cached_data = msgspec.msgpack.encode({
+        "chunk_id": "test_chunk_0",
+        "embedding_provider": "nomic",
+        "embedding": [0.4, 0.5, 0.6],
+        "metadata": {}
+    })
+    redis_client = embedding_service.cache.redis_client
+    redis_client.mget.side_effect = lambda keys: [
+        cached_data if key.endswith("test_chunk_0") else None for key in keys
+    ]
+    
+    with patch.object(
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
+        new_callable=AsyncMock,
+        side_effect=lambda texts: [[0.1, 0.2, 0.3]] * len(texts)
+    ) as generate:
+        results = await embedding_service.generate_embeddings(
+            sample_chunks,
+            provider_name="nomic",
+            batch_size=2
+        )
+        
+        assert [r.chunk_id for r in results] == [c.chunk_id for c in sample_chunks]
+        # The two misses share one full batch instead of straddling two
+        generate.assert_awaited_once_with(["Test content 1", "Test content 2"])
+        redis_client.mget.assert_called_once()
+
 @pytest.mark.asyncio
 async def test_generate_embeddings_error_handling(embedding_service, sample_chunks):
     with patch.object(
-        BaseEmbeddingProvider,
-        'generate_embedding',
+        NomicEmbeddingProvider,
+        'generate_embeddings_batch',
         new_callable=AsyncMock,
         side_effect=EmbeddingError("API Error", "nomic", 500)
     ):
@@ -142,24 +291,19 @@ async def test_retry_on_failure(embedding_service, sample_chunks):
         settings.NOMIC_MODEL_NAME
     )
     
-    # Create a mock session with retry behavior
-    mock_session = AsyncMock()
     mock_response = AsyncMock()
     mock_response.status = 200
     mock_response.json = AsyncMock(return_value={"embeddings": [mock_embedding]})
     mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_response.__aexit__ = AsyncMock()
+    mock_response.__aexit__ = AsyncMock(return_value=False)
     
-    # First call raises error, second call succeeds
-    mock_session.post = AsyncMock(side_effect=[
+    # First call raises error, second call succeeds; post() is used as an
+    # async context manager, so it is a plain (not awaited) mock
+    session = await provider._ensure_session()
+    with patch.object(session, "post", MagicMock(side_effect=[
         aiohttp.ClientError(),  # First attempt fails
         mock_response  # Second attempt succeeds
-    ])
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock()
-    
-    # Mock the session creation
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    ])) as mock_post:
         result, was_cached = await embedding_service._generate_single_embedding(
             sample_chunks[0],
             "nomic",
@@ -167,7 +311,9 @@ async def test_retry_on_failure(embedding_service, sample_chunks):
         )
         
         assert result.embedding == mock_embedding
-        assert mock_session.post.call_count == 2  # Verify retry happened
+        assert mock_post.call_count == 2  # Verify retry happened
+    
+    await provider.close()
 
 @pytest.mark.asyncio
 async def test_nomic_provider_format(embedding_service):
@@ -184,6 +330,10 @@ async def test_nomic_provider_format(embedding_service):
     mock_response = {"embeddings": [[0.1, 0.2, 0.3]]}
     result = provider._parse_response(mock_response)
     assert result == [0.1, 0.2, 0.3]
+    
+    # Test batch format
+    assert provider._get_batch_payload(["a", "b"])["texts"] == ["a", "b"]
+    assert provider._parse_batch_response({"embeddings": [[0.1], [0.2]]}) == [[0.1], [0.2]]
 
 @pytest.mark.asyncio
 async def test_granite_provider_format(embedding_service):
@@ -203,4 +353,9 @@ async def test_granite_provider_format(embedding_service):
     # Test response parsing
     mock_response = {"data": [{"embedding": [0.1, 0.2, 0.3]}]}
     result = provider._parse_response(mock_response)
-    assert result == [0.1, 0.2, 0.3]
\ No newline at end of file
+    assert result == [0.1, 0.2, 0.3]
+    
+    # Test batch format
+    assert provider._get_batch_payload(["a", "b"])["input"] == ["a", "b"]
+    mock_response = {"data": [{"index": 1, "embedding": [0.2]}, {"index": 0, "embedding": [0.1]}]}
+    assert provider._parse_batch_response(mock_response) == [[0.1], [0.2]]
\ No newline at end of file
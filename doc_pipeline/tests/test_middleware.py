@@ -0,0 +1,78 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from ..api.middleware import CORSMiddleware
+
+def _homepage(request):
+    return PlainTextResponse("Homepage")
+
+@pytest.fixture
+def app():
+    app = Starlette(routes=[Route("/", _homepage)])
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+def test_preflight_request(app):
+    client = TestClient(app)
+    response = client.options("/", headers={
+        "Origin": "https://example.org",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "X-Example",
+    })
+
+    assert response.status_code == 200
+    assert response.text == "OK"
+    assert response.headers["access-control-allow-origin"] == "https://example.org"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "X-Example"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+def test_simple_request(app):
+    client = TestClient(app)
+    response = client.get("/", headers={"Origin": "https://example.org"})
+
+    assert response.status_code == 200
+    assert response.text == "Homepage"
+    assert response.headers["access-control-allow-origin"] == "https://example.org"
+    assert response.headers["vary"] == "Origin"
+
+def test_request_without_origin(app):
+    client = TestClient(app)
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+def test_disallowed_origin():
+    app = Starlette(routes=[Route("/", _homepage)])
+    app.add_middleware(CORSMiddleware, allow_origins=["https://example.org"], allow_methods=["GET"])
+    client = TestClient(app)
+
+    response = client.options("/", headers={
+        "Origin": "https://other.org",
+        "Access-Control-Request-Method": "GET",
+    })
+    assert response.status_code == 400
+
+    response = client.get("/", headers={"Origin": "https://example.org"})
+    assert response.headers["access-control-allow-origin"] == "https://example.org"
+
+def test_disallowed_method():
+    app = Starlette(routes=[Route("/", _homepage)])
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["GET"])
+    client = TestClient(app)
+
+    response = client.options("/", headers={
+        "Origin": "https://example.org",
+        "Access-Control-Request-Method": "DELETE",
+    })
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS request"
@@ -0,0 +1,15 @@
+"""orjson-backed JSON helpers for the Redis cache payloads."""
+from typing import Any, Union
+import orjson
+
+_DUMPS_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes; datetimes become ISO 8601 strings in UTC."""
+    return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    return orjson.loads(data)
@@ -1,19 +1,79 @@
 import logging
-import json
 from datetime import datetime, UTC
-from typing import Any, Dict
-from pythonjsonlogger.json import JsonFormatter
+import orjson
 import sys
 
-class CustomJsonFormatter(JsonFormatter):
-    def add_fields(self, log_record: Dict[str, Any], record: logging.LogRecord, message_dict: Dict[str, Any]) -> None:
-        super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
-        log_record['timestamp'] = datetime.now(UTC).isoformat()
-        log_record['level'] = record.levelname
-        log_record['module'] = record.module
-        log_record['function'] = record.funcName
+_EXC_FORMATTER = logging.Formatter()
+
+# (second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp formatted; kept as one
+# tuple so concurrent handlers never see a mismatched pair
+_last_second = (-1, "")
+
+def _format_timestamp(created: float) -> str:
+    """ISO 8601 UTC timestamp for a record time, reusing the formatted second."""
+    global _last_second
+    second = int(created)
+    cached_second, prefix = _last_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        _last_second = (second, prefix)
+    micros = min(round((created - second) * 1_000_000), 999_999)
+    return f"{prefix}.{micros:06d}+00:00"
+
+SERVICE_NAME = "doc_pipeline"
+
+_record_factory_installed = False
+
+def _install_record_factory() -> None:
+    """Stamp static fields onto every LogRecord once, at creation."""
+    global _record_factory_installed
+    if _record_factory_installed:
+        return
+    base_factory = logging.getLogRecordFactory()
+
+    def record_factory(*args, **kwargs) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
+        record.service = SERVICE_NAME
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+    _record_factory_installed = True
+
+class OrjsonHandler(logging.StreamHandler):
+    """Stream handler that writes each record as one orjson-encoded line.
+
+    Emits message, timestamp, level, module, function and service without
+    going through Formatter.format and json.dumps.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            log_record = {
+                "message": record.getMessage(),
+                "timestamp": _format_timestamp(record.created),
+                "level": record.levelname,
+                "module": record.module,
+                "function": record.funcName,
+                "service": getattr(record, "service", SERVICE_NAME),
+            }
+            if record.exc_info:
+                log_record["exc_info"] = _EXC_FORMATTER.formatException(record.exc_info)
+            if record.stack_info:
+                log_record["stack_info"] = _EXC_FORMATTER.formatStack(record.stack_info)
+            line = orjson.dumps(log_record, default=str) + b"\n"
+            buffer = getattr(self.stream, "buffer", None)
+            if buffer is not None:
+                buffer.write(line)
+            else:
+                self.stream.write(line.decode("utf-8"))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
+    _install_record_factory()
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
@@ -21,10 +81,7 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     logger.handlers = []
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(CustomJsonFormatter(
-        '%(timestamp)s %(level)s %(module)s %(function)s %(message)s'
-    ))
+    console_handler = OrjsonHandler(sys.stdout)
     logger.addHandler(console_handler)
     
     return logger
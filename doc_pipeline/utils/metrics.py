@@ -1,65 +1,171 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+import inspect
 import time
-from prometheus_client import Counter, Histogram, Gauge
+from bisect import bisect_left
+import numpy as np
+from prometheus_client import REGISTRY, Counter, Histogram, Gauge
 from functools import wraps
 import logging
 
+# Chunk sizes span orders of magnitude, so double the bound per bucket: 128 B to 4 MiB
+CHUNK_SIZE_BUCKETS = tuple(2**i * 128 for i in range(16))
+
+# The defaults minus their .075/.75/7.5 steps
+PROCESSING_TIME_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+def _get_or_create(cls, name: str, documentation: str, labelnames=(), **kwargs):
+    """Create a metric, or return the one already registered under name.
+
+    Re-importing a metrics module (reloader, repeated test imports) would
+    otherwise fail with "Duplicated timeseries in CollectorRegistry".
+    """
+    existing = REGISTRY._names_to_collectors.get(name)
+    if existing is not None:
+        return existing
+    # Anything else wrong with the definition raises from the constructor as usual
+    return cls(name, documentation, labelnames, **kwargs)
+
 # Metrics
-CHUNK_COUNTER = Counter(
+CHUNK_COUNTER = _get_or_create(
+    Counter,
     'document_chunks_total',
     'Total number of chunks created',
     ['strategy', 'status']
 )
 
-CHUNK_SIZE_HISTOGRAM = Histogram(
+CHUNK_SIZE_HISTOGRAM = _get_or_create(
+    Histogram,
     'chunk_size_bytes',
     'Distribution of chunk sizes in bytes',
-    ['strategy']
+    ['strategy'],
+    buckets=CHUNK_SIZE_BUCKETS
 )
 
-PROCESSING_TIME_HISTOGRAM = Histogram(
+PROCESSING_TIME_HISTOGRAM = _get_or_create(
+    Histogram,
     'document_processing_seconds',
     'Time spent processing documents',
-    ['operation']
+    ['operation'],
+    buckets=PROCESSING_TIME_BUCKETS
 )
 
-ACTIVE_DOCUMENTS_GAUGE = Gauge(
+ACTIVE_DOCUMENTS_GAUGE = _get_or_create(
+    Gauge,
     'active_documents',
-    'Number of documents currently being processed'
+    'Number of documents currently being processed',
+    (),
+    multiprocess_mode='livesum'  # Summed over live workers in multi-process mode
 )
 
+# Below this many observations numpy's call overhead outweighs the bisect loop
+_VECTORIZED_OBSERVE_MIN = 64
+
+# ChunkingStrategy's values, repeated here because docling_service imports this module
+KNOWN_STRATEGIES = ("hybrid", "markdown", "sentence", "recursive", "fallback")
+
+PROC_CHUNKING_TIME = PROCESSING_TIME_HISTOGRAM.labels(operation='chunking')
+
+# (success counter, error counter, size histogram) children per strategy
+_STRATEGY_CHILDREN: Dict[str, Tuple[Counter, Counter, Histogram]] = {}
+
+def _strategy_children(strategy: str) -> Tuple[Counter, Counter, Histogram]:
+    """Return the bound children for strategy, binding them on first use."""
+    children = _STRATEGY_CHILDREN.get(strategy)
+    if children is None:
+        children = _STRATEGY_CHILDREN[strategy] = (
+            CHUNK_COUNTER.labels(strategy=strategy, status='success'),
+            CHUNK_COUNTER.labels(strategy=strategy, status='error'),
+            CHUNK_SIZE_HISTOGRAM.labels(strategy=strategy)
+        )
+    return children
+
+# Bound at import, which also exports every known series from the first scrape
+for _strategy in KNOWN_STRATEGIES:
+    _strategy_children(_strategy)
+
+# prometheus_client Histogram internals _observe_many writes to directly, as of
+# 0.26; with any of them missing it falls back to observe()
+_HISTOGRAM_INTERNALS = ("_raise_if_not_observable", "_upper_bounds", "_buckets", "_sum")
+
+def _observe_many(histogram: Histogram, amounts: List[float]) -> None:
+    """Record many observations with one increment per touched bucket.
+
+    Equivalent to calling observe() for each amount (without exemplars), but
+    takes each bucket's lock once rather than once per observation.
+    """
+    if not all(hasattr(histogram, name) for name in _HISTOGRAM_INTERNALS):
+        # Labelled parents lack the buckets, and observe() raises for them
+        for amount in amounts:
+            histogram.observe(amount)
+        return
+    histogram._raise_if_not_observable()
+    bounds = histogram._upper_bounds
+    if len(amounts) >= _VECTORIZED_OBSERVE_MIN:
+        values = np.asarray(amounts, dtype=np.float64)
+        # side='left' finds the first bound >= amount, matching observe()'s amount <= bound
+        counts = np.bincount(np.searchsorted(bounds, values, side='left'), minlength=len(bounds)).tolist()
+        total = float(values.sum())
+    else:
+        counts = [0] * len(bounds)
+        for amount in amounts:
+            counts[bisect_left(bounds, amount)] += 1
+        total = sum(amounts)
+    for bucket, count in zip(histogram._buckets, counts):
+        if count:
+            bucket.inc(count)
+    histogram._sum.inc(total)
+
 def log_chunking_metrics(strategy: str, chunks: list, processing_time: float):
     """Log metrics about chunking operation."""
-    CHUNK_COUNTER.labels(strategy=strategy, status='success').inc(len(chunks))
+    success_counter, _, size_histogram = _strategy_children(strategy)
+    success_counter.inc(len(chunks))
+    _observe_many(size_histogram, [len(chunk.content) for chunk in chunks])
+    PROC_CHUNKING_TIME.observe(processing_time)
+
+def track_processing_time(func):
+    """Decorator to track processing time of functions.
+
+    The time is observed under the function's name; use track_chunking for
+    functions that return chunks.
+    """
+    operation_time = PROCESSING_TIME_HISTOGRAM.labels(operation=func.__name__)
     
-    for chunk in chunks:
-        CHUNK_SIZE_HISTOGRAM.labels(strategy=strategy).observe(len(chunk.content))
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        ACTIVE_DOCUMENTS_GAUGE.inc()
+        start_ns = time.perf_counter_ns()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            operation_time.observe((time.perf_counter_ns() - start_ns) * 1e-9)
+            ACTIVE_DOCUMENTS_GAUGE.dec()
     
-    PROCESSING_TIME_HISTOGRAM.labels(operation='chunking').observe(processing_time)
+    return wrapper
 
-def track_processing_time(func):
-    """Decorator to track processing time of functions."""
+def track_chunking(func):
+    """Decorator to track processing time and chunk metrics of a function returning chunks."""
+    # The strategy argument is found by position too, since callers pass it either way
+    params = list(inspect.signature(func).parameters)
+    strategy_index = params.index('chunking_strategy') if 'chunking_strategy' in params else None
+    
     @wraps(func)
     async def wrapper(*args, **kwargs):
+        strategy = kwargs.get('chunking_strategy')
+        if strategy is None and strategy_index is not None and len(args) > strategy_index:
+            strategy = args[strategy_index]
+        strategy = strategy or 'hybrid'
+        
         ACTIVE_DOCUMENTS_GAUGE.inc()
-        start_time = time.time()
+        # Monotonic integer clock; converted to seconds only when observed
+        start_ns = time.perf_counter_ns()
         try:
             result = await func(*args, **kwargs)
-            processing_time = time.time() - start_time
-            
-            # Log metrics if result contains chunks
-            if hasattr(result, '__iter__'):
-                strategy = kwargs.get('chunking_strategy', 'hybrid')
-                log_chunking_metrics(strategy, result, processing_time)
-            
+            log_chunking_metrics(strategy, result, (time.perf_counter_ns() - start_ns) * 1e-9)
             return result
         except Exception as e:
-            CHUNK_COUNTER.labels(
-                strategy=kwargs.get('chunking_strategy', 'hybrid'),
-                status='error'
-            ).inc()
+            _strategy_children(strategy)[1].inc()
             raise
         finally:
             ACTIVE_DOCUMENTS_GAUGE.dec()
     
-    return wrapper
\ No newline at end of file
+    return wrapper
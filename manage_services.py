@@ -1,18 +1,24 @@
+import json
 import subprocess
 import sys
 import time
 import os
 
-def run_command(command):
+# Compose names the container <project>-redis-<n>, so match on the prefix
+REDIS_CONTAINER = "doc_pipeline2-redis"
+REDIS_READY_TIMEOUT = 20  # Seconds to wait for the healthcheck after `up`
+
+def run_command(argv):
+    """Run argv directly (no intermediate shell) and return (ok, stdout, stderr)."""
     try:
-        result = subprocess.run(command, shell=True, text=True, capture_output=True)
+        result = subprocess.run(argv, text=True, capture_output=True)
         return result.returncode == 0, result.stdout, result.stderr
     except Exception as e:
         return False, "", str(e)
 
 def check_docker():
     print("\nChecking Docker status...")
-    success, stdout, stderr = run_command("docker info")
+    success, stdout, stderr = run_command(["docker", "info"])
     if not success:
         print("✗ Docker is not running or not accessible")
         print(f"Error: {stderr}")
@@ -20,10 +26,23 @@ def check_docker():
     print("✓ Docker is running")
     return True
 
-def check_redis():
+def docker_snapshot():
+    """Return running containers keyed by name from one `docker ps` call, or None if docker fails."""
+    success, stdout, stderr = run_command(["docker", "ps", "--format", "{{json .}}"])
+    if not success:
+        return None
+    containers = {}
+    for line in stdout.splitlines():
+        if line.strip():
+            container = json.loads(line)
+            containers[container["Names"]] = container
+    return containers
+
+def check_redis(snapshot=None):
     print("\nChecking Redis container...")
-    success, stdout, stderr = run_command("docker ps --filter name=doc_pipeline2-redis -q")
-    if not stdout.strip():
+    if snapshot is None:
+        snapshot = docker_snapshot() or {}
+    if not any(REDIS_CONTAINER in name for name in snapshot):
         print("✗ Redis container is not running")
         return False
     print("✓ Redis container is running")
@@ -31,24 +50,36 @@ def check_redis():
 
 def start_redis():
     print("\nStarting Redis...")
-    success, stdout, stderr = run_command("docker-compose up -d redis")
+    success, stdout, stderr = run_command(["docker-compose", "up", "-d", "redis"])
     if not success:
         print(f"✗ Failed to start Redis: {stderr}")
         return False
     
-    # Wait for Redis to be ready
+    # Wait for the compose healthcheck (redis-cli ping) to pass rather than
+    # sleeping a fixed interval between container listings
     print("Waiting for Redis to be ready...")
-    for _ in range(5):
-        if check_redis():
-            return True
-        time.sleep(2)
+    success, stdout, stderr = run_command(["docker-compose", "ps", "-q", "redis"])
+    container_id = stdout.strip()
+    if success and container_id:
+        deadline = time.monotonic() + REDIS_READY_TIMEOUT
+        while time.monotonic() < deadline:
+            success, stdout, stderr = run_command(
+                ["docker", "inspect", "--format", "{{.State.Health.Status}}", container_id]
+            )
+            status = stdout.strip()
+            if status == "healthy":
+                print("✓ Redis is healthy")
+                return True
+            if not success or status == "unhealthy":
+                break
+            time.sleep(0.05)
     
     print("✗ Redis failed to start properly")
     return False
 
 def stop_redis():
     print("\nStopping Redis...")
-    success, stdout, stderr = run_command("docker-compose stop redis")
+    success, stdout, stderr = run_command(["docker-compose", "stop", "redis"])
     if not success:
         print(f"✗ Failed to stop Redis: {stderr}")
         return False
@@ -62,7 +93,7 @@ def restart_redis():
 
 def show_logs():
     print("\nShowing container logs...")
-    success, stdout, stderr = run_command("docker-compose logs --tail=100")
+    success, stdout, stderr = run_command(["docker-compose", "logs", "--tail=100"])
     if not success:
         print(f"✗ Failed to get logs: {stderr}")
     else:
@@ -1,6 +1,8 @@
 import asyncio
+from typing import Optional
 from elasticsearch import AsyncElasticsearch
 import redis as redis_client  # Renamed to avoid conflict
+import redis.asyncio as aioredis
 import os
 from dotenv import load_dotenv
 
@@ -17,58 +19,72 @@ REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', '6379'))
 REDIS_PASS = os.getenv('REDIS_PASSWORD', '')
 
+_ES_CLIENT: Optional[AsyncElasticsearch] = None
+
+def get_es() -> AsyncElasticsearch:
+    """Return the script's Elasticsearch client, creating it on first use."""
+    global _ES_CLIENT
+    if _ES_CLIENT is None:
+        _ES_CLIENT = AsyncElasticsearch(
+            hosts=[f"{ES_HOST}:{ES_PORT}"],
+            basic_auth=(ES_USER, ES_PASS) if ES_USER else None,
+            connections_per_node=32
+        )
+    return _ES_CLIENT
+
+async def close_es() -> None:
+    global _ES_CLIENT
+    if _ES_CLIENT is not None:
+        await _ES_CLIENT.close()
+        _ES_CLIENT = None
+
 async def test_elasticsearch():
     print(f"\nTesting Elasticsearch connection to {ES_HOST}:{ES_PORT}")
     
-    es = AsyncElasticsearch(
-        hosts=[f"{ES_HOST}:{ES_PORT}"],
-        basic_auth=(ES_USER, ES_PASS) if ES_USER else None
-    )
+    es = get_es()
     
     try:
-        info = await es.info()
+        info = await es.options(request_timeout=5).info()
         print("✓ Successfully connected to Elasticsearch!")
         print(f"  Version: {info['version']['number']}")
         print(f"  Cluster: {info['cluster_name']}")
         
-        # Check indices
-        indices = await es.indices.get_alias()
+        # Check indices; the cat API returns just the names, not every alias mapping
+        indices = await es.options(request_timeout=5).cat.indices(h="index", format="json")
         print("\nExisting indices:")
-        for index in indices:
-            print(f"  - {index}")
+        for row in indices:
+            print(f"  - {row['index']}")
             
     except Exception as e:
         print(f"✗ Error connecting to Elasticsearch: {str(e)}")
-    
-    finally:
-        await es.close()
 
-def test_redis():
+async def test_redis():
     print(f"\nTesting Redis connection to {REDIS_HOST}:{REDIS_PORT}")
     
+    # Constructing the client opens no connection, so it cannot fail here
+    r = aioredis.Redis(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        password=REDIS_PASS if REDIS_PASS else None,
+        decode_responses=True
+    )
+    
     try:
-        # Create Redis client
-        r = redis_client.Redis(
-            host=REDIS_HOST,
-            port=REDIS_PORT,
-            password=REDIS_PASS if REDIS_PASS else None,
-            decode_responses=True
-        )
+        # Ping, operations and cleanup in a single round trip
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.ping()
+            pipe.set("test_key", "test_value")
+            pipe.get("test_key")
+            pipe.delete("test_key")
+            ping_ok, _, value, _ = await pipe.execute()
         
-        # Test connection
-        if r.ping():
+        if ping_ok:
             print("✓ Successfully connected to Redis!")
             
-            # Test operations
-            r.set("test_key", "test_value")
-            value = r.get("test_key")
             if value == "test_value":
                 print("✓ Redis operations working correctly")
             else:
                 print("✗ Redis operations failed")
-            
-            # Clean up
-            r.delete("test_key")
         else:
             print("✗ Redis ping failed")
             
@@ -78,15 +94,15 @@ def test_redis():
         print(f"✗ Error with Redis: {str(e)}")
     
     finally:
-        try:
-            r.close()
-        except:
-            pass
+        await r.aclose()
 
 async def main():
     print("Testing connections to services...")
-    await test_elasticsearch()
-    test_redis()  # Redis test is now synchronous
+    try:
+        # Independent services, so check both at once
+        await asyncio.gather(test_elasticsearch(), test_redis())
+    finally:
+        await close_es()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,35 +1,33 @@
 import asyncio
-from elasticsearch import AsyncElasticsearch
 from doc_pipeline.config.settings import settings
+from doc_pipeline.services._es import get_es_client, close_es_client
 
 async def test_elasticsearch_connection():
     print(f"Testing connection to Elasticsearch at {settings.ELASTICSEARCH_HOST}:{settings.ELASTICSEARCH_PORT}")
     
-    es = AsyncElasticsearch(
-        hosts=[f"{settings.ELASTICSEARCH_HOST}:{settings.ELASTICSEARCH_PORT}"],
-        basic_auth=(
-            settings.ELASTICSEARCH_USERNAME,
-            settings.ELASTICSEARCH_PASSWORD
-        ) if settings.ELASTICSEARCH_USERNAME else None
-    )
+    # The same pooled client the services use
+    es = get_es_client()
     
     try:
-        info = await es.info()
+        info = await es.options(request_timeout=5).info()
         print("Successfully connected to Elasticsearch!")
         print(f"Elasticsearch version: {info['version']['number']}")
         print(f"Cluster name: {info['cluster_name']}")
         
-        # Check indices
-        indices = await es.indices.get_alias()
+        # Check indices; the cat API returns just the names, not every alias mapping
+        indices = await es.options(request_timeout=5).cat.indices(h="index", format="json")
         print("\nExisting indices:")
-        for index in indices:
-            print(f"- {index}")
+        for row in indices:
+            print(f"- {row['index']}")
             
     except Exception as e:
         print(f"Error connecting to Elasticsearch: {str(e)}")
-    
+
+async def main():
+    try:
+        await test_elasticsearch_connection()
     finally:
-        await es.close()
+        await close_es_client()  # Once, on the way out
 
 if __name__ == "__main__":
-    asyncio.run(test_elasticsearch_connection())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,16 +1,31 @@
 import asyncio
 import aiohttp
-import json
+import orjson
 import sys
 from pathlib import Path
-from elasticsearch import AsyncElasticsearch
-from doc_pipeline.config.settings import settings
+from doc_pipeline.services._es import get_es_client, close_es_client
+
+def _json_dumps(obj) -> str:
+    """orjson encoder for aiohttp, which expects a str back."""
+    return orjson.dumps(obj).decode()
+
+STATUS_TIMEOUT = 30  # Seconds to wait for processing overall
+STATUS_WAIT = 10  # Seconds the server may hold each status request
+TERMINAL_STATUSES = ("completed", "failed")  # DocumentStatus values are lowercase
+
+async def _generate_embedding(session: aiohttp.ClientSession, url: str, text: str, provider: str, label: str):
+    async with session.post(url, json={"text": text, "provider": provider}) as response:
+        if response.status != 200:
+            print(f"Error generating {label} embedding: {await response.text()}")
+        else:
+            result = await response.json(loads=orjson.loads)
+            print(f"{label} embedding generated. Dimension: {len(result['embedding'])}")
 
 async def test_full_pipeline(file_path: str):
     """Test the complete document processing pipeline including embeddings and vector storage."""
     base_url = "http://localhost:8000/api/v1/documents"
     
-    async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(json_serialize=_json_dumps) as session:
         # 1. Upload document
         print(f"\n1. Uploading document: {file_path}")
         with open(file_path, 'rb') as f:
@@ -25,34 +40,35 @@ async def test_full_pipeline(file_path: str):
                     print(f"Error uploading document: {await response.text()}")
                     return
                 
-                result = await response.json()
+                result = await response.json(loads=orjson.loads)
                 doc_id = result['doc_id']
                 print(f"Document uploaded successfully. ID: {doc_id}")
         
         # 2. Monitor processing status
         print("\n2. Monitoring processing status...")
-        max_attempts = 30
-        attempt = 0
+        # Long-poll: the server holds each request until processing finishes
+        # (within {STATUS_WAIT}s); between requests, back off exponentially
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STATUS_TIMEOUT
+        delay = 0.1
         
-        while attempt < max_attempts:
-            async with session.get(f"{base_url}/documents/{doc_id}/status") as response:
+        while True:
+            async with session.get(f"{base_url}/documents/{doc_id}/status", params={"wait": STATUS_WAIT}) as response:
                 if response.status != 200:
                     print(f"Error checking status: {await response.text()}")
                     return
                 
-                status = await response.text()
-                status = status.strip('"')
+                status = await response.json(loads=orjson.loads)
                 print(f"Status: {status}")
                 
-                if status in ['COMPLETED', 'FAILED']:
+                if status in TERMINAL_STATUSES:
                     break
-                
-                attempt += 1
-                await asyncio.sleep(1)
-        
-        if attempt >= max_attempts:
-            print("Timeout waiting for processing to complete")
-            return
+            
+            if loop.time() + delay >= deadline:
+                print("Timeout waiting for processing to complete")
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.7, 5.0)
         
         # 3. Retrieve processed document and chunks
         print("\n3. Retrieving processed document...")
@@ -61,7 +77,7 @@ async def test_full_pipeline(file_path: str):
                 print(f"Error retrieving document: {await response.text()}")
                 return
             
-            document = await response.json()
+            document = await response.json(loads=orjson.loads)
             
             print("\nDocument Details:")
             print(f"ID: {document['doc_id']}")
@@ -75,45 +91,17 @@ async def test_full_pipeline(file_path: str):
                 first_chunk = document['chunks'][0]
                 print("\n4. Generating embeddings for first chunk...")
                 
-                # Generate Nomic embedding
-                print("\nGenerating Nomic embedding...")
-                async with session.post(
-                    f"{base_url}/embeddings/generate",
-                    json={
-                        "text": first_chunk['content'],
-                        "provider": "nomic"
-                    }
-                ) as response:
-                    if response.status != 200:
-                        print(f"Error generating Nomic embedding: {await response.text()}")
-                    else:
-                        nomic_result = await response.json()
-                        print(f"Nomic embedding generated. Dimension: {len(nomic_result['embedding'])}")
-                
-                # Generate Granite embedding
-                print("\nGenerating Granite embedding...")
-                async with session.post(
-                    f"{base_url}/embeddings/generate",
-                    json={
-                        "text": first_chunk['content'],
-                        "provider": "granite"
-                    }
-                ) as response:
-                    if response.status != 200:
-                        print(f"Error generating Granite embedding: {await response.text()}")
-                    else:
-                        granite_result = await response.json()
-                        print(f"Granite embedding generated. Dimension: {len(granite_result['embedding'])}")
+                # Both providers at once: wall time is the slower call, not the sum
+                print("\nGenerating Nomic and Granite embeddings...")
+                async with asyncio.TaskGroup() as tg:
+                    for provider, label in (("nomic", "Nomic"), ("granite", "Granite")):
+                        tg.create_task(_generate_embedding(
+                            session, f"{base_url}/embeddings/generate", first_chunk['content'], provider, label
+                        ))
 
         # 5. Verify vectors in Elasticsearch
         print("\n5. Verifying vectors in Elasticsearch...")
-        es = AsyncElasticsearch(
-            hosts=[f"{settings.ELASTICSEARCH_HOST}:{settings.ELASTICSEARCH_PORT}"],
-            basic_auth=(
-                settings.ELASTICSEARCH_USERNAME,
-                settings.ELASTICSEARCH_PASSWORD
-            ) if settings.ELASTICSEARCH_USERNAME else None
-        )
+        es = get_es_client()  # The same pooled client the services use
         
         try:
             # Check index exists
@@ -121,37 +109,47 @@ async def test_full_pipeline(file_path: str):
             if index_exists:
                 print("Document embeddings index exists")
                 
-                # Get index mapping
-                mapping = await es.indices.get_mapping(index="document_embeddings")
-                print("\nIndex mapping:")
-                print(json.dumps(mapping, indent=2))
-                
-                # Search for embeddings of the first chunk
-                search_result = await es.search(
-                    index="document_embeddings",
-                    body={
-                        "query": {
-                            "match": {
-                                "chunk_id": first_chunk['chunk_id']
-                            }
+                # Get index mapping and search for embeddings of the first chunk together
+                mapping, search_result = await asyncio.gather(
+                    es.indices.get_mapping(index="document_embeddings"),
+                    es.search(
+                        index="document_embeddings",
+                        body={
+                            "query": {
+                                "term": {
+                                    "chunk_id": first_chunk['chunk_id']
+                                }
+                            },
+                            # Only the provider and the vector's length come back,
+                            # not the vector itself
+                            "_source": ["embedding_provider"],
+                            "script_fields": {
+                                "dim": {"script": {"source": "params._source.embedding.size()"}}
+                            },
+                            "size": 5
                         }
-                    }
+                    )
                 )
+                print("\nIndex mapping:")
+                print(orjson.dumps(mapping.body, option=orjson.OPT_INDENT_2).decode())
                 
                 hits = search_result['hits']['hits']
                 print(f"\nFound {len(hits)} embeddings for chunk {first_chunk['chunk_id']}")
                 for hit in hits:
                     print(f"Provider: {hit['_source']['embedding_provider']}")
-                    print(f"Embedding dimension: {len(hit['_source']['embedding'])}")
+                    print(f"Embedding dimension: {hit['fields']['dim'][0]}")
                     print(f"Score: {hit['_score']}")
             else:
                 print("Document embeddings index does not exist!")
                 
         except Exception as e:
             print(f"Error checking Elasticsearch: {str(e)}")
-        
-        finally:
-            await es.close()
+
+async def _run(file_path: str):
+    try:
+        await test_full_pipeline(file_path)
+    finally:
+        await close_es_client()  # Once, on the way out
 
 def main():
     if len(sys.argv) != 2:
@@ -163,7 +161,7 @@ def main():
         print(f"File not found: {file_path}")
         sys.exit(1)
     
-    asyncio.run(test_full_pipeline(file_path))
+    asyncio.run(_run(file_path))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
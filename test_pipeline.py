@@ -1,15 +1,23 @@
 import asyncio
 import aiohttp
-import json
+import orjson
 import sys
 from pathlib import Path
 import time
 
+def _json_dumps(obj) -> str:
+    """orjson encoder for aiohttp, which expects a str back."""
+    return orjson.dumps(obj).decode()
+
+STATUS_TIMEOUT = 30  # Seconds to wait for processing overall
+STATUS_WAIT = 10  # Seconds the server may hold each status request
+TERMINAL_STATUSES = ("completed", "failed")  # DocumentStatus values are lowercase
+
 async def test_pipeline(file_path: str):
     """Test the document processing pipeline with a file."""
     base_url = "http://localhost:8000/api/v1/documents/documents"
     
-    async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(json_serialize=_json_dumps) as session:
         # 1. Upload document
         print(f"\n1. Uploading document: {file_path}")
         with open(file_path, 'rb') as f:
@@ -24,34 +32,35 @@ async def test_pipeline(file_path: str):
                     print(f"Error uploading document: {await response.text()}")
                     return
                 
-                result = await response.json()
+                result = await response.json(loads=orjson.loads)
                 doc_id = result['doc_id']
                 print(f"Document uploaded successfully. ID: {doc_id}")
         
         # 2. Monitor processing status
         print("\n2. Monitoring processing status...")
-        max_attempts = 30
-        attempt = 0
+        # Long-poll: the server holds each request until processing finishes
+        # (within {STATUS_WAIT}s); between requests, back off exponentially
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STATUS_TIMEOUT
+        delay = 0.1
         
-        while attempt < max_attempts:
-            async with session.get(f"{base_url}/{doc_id}/status") as response:
+        while True:
+            async with session.get(f"{base_url}/{doc_id}/status", params={"wait": STATUS_WAIT}) as response:
                 if response.status != 200:
                     print(f"Error checking status: {await response.text()}")
                     return
                 
-                status = await response.text()
-                status = status.strip('"')  # Remove quotes from status string
+                status = await response.json(loads=orjson.loads)
                 print(f"Status: {status}")
                 
-                if status in ['COMPLETED', 'FAILED']:
+                if status in TERMINAL_STATUSES:
                     break
-                
-                attempt += 1
-                await asyncio.sleep(1)
-        
-        if attempt >= max_attempts:
-            print("Timeout waiting for processing to complete")
-            return
+            
+            if loop.time() + delay >= deadline:
+                print("Timeout waiting for processing to complete")
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.7, 5.0)
         
         # 3. Retrieve processed document
         print("\n3. Retrieving processed document...")
@@ -60,7 +69,7 @@ async def test_pipeline(file_path: str):
                 print(f"Error retrieving document: {await response.text()}")
                 return
             
-            document = await response.json()
+            document = await response.json(loads=orjson.loads)
             
             print("\nDocument Details:")
             print(f"ID: {document['doc_id']}")
@@ -74,7 +83,7 @@ async def test_pipeline(file_path: str):
                 print("\nChunk ID:", chunk['chunk_id'])
                 print("Page:", chunk['page_number'])
                 print("Content:", chunk['content'][:200] + "..." if len(chunk['content']) > 200 else chunk['content'])
-                print("Metadata:", json.dumps(chunk['metadata'], indent=2))
+                print("Metadata:", orjson.dumps(chunk['metadata'], option=orjson.OPT_INDENT_2).decode())
 
 def main():
     if len(sys.argv) != 2:
@@ -1,35 +1,35 @@
 import asyncio
-import redis.asyncio as rds  # Use the async version
 from doc_pipeline.config.settings import settings
+from doc_pipeline.services._redis import get_redis, close_redis_pool
 
 async def test_redis_connection():
     print(f"Testing connection to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
     
-    redis = rds.from_url(
-        f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-        password=settings.REDIS_PASSWORD,
-        encoding="utf-8",
-        decode_responses=True
-    )
+    # A client on the same shared pool the services use
+    redis = get_redis()
     
     try:
         # Test connection
         await redis.ping()
         print("Successfully connected to Redis!")
         
-        # Test basic operations
-        await redis.set("test_key", "test_value")
-        value = await redis.get("test_key")
-        print(f"Test key-value operation successful: {value == 'test_value'}")
-        
-        # Clean up
-        await redis.delete("test_key")
+        # Test basic operations, cleanup included, in a single round trip
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set("test_key", "test_value").get("test_key").delete("test_key")
+            _, value, _ = await pipe.execute()
+        print(f"Test key-value operation successful: {value == b'test_value'}")
         
     except Exception as e:
         print(f"Error connecting to Redis: {str(e)}")
     
     finally:
-        await redis.aclose()  # Use aclose() instead of close()
+        await redis.aclose()  # Releases the client; the pool stays up
+
+async def main():
+    try:
+        await test_redis_connection()
+    finally:
+        await close_redis_pool()  # Once, on the way out
 
 if __name__ == "__main__":
-    asyncio.run(test_redis_connection())
+    asyncio.run(main())